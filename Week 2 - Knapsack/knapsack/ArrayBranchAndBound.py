@@ -0,0 +1,128 @@
+#Branch and Bound using Depth First Search over preallocated arrays
+#The search keeps one slot per level (value, capacity and next branch to try) instead of one Node object per branch,
+#so memory is bounded by the depth of the tree and the path is encoded by the taken/skip decision stack
+import time
+from BoundOracle import BoundOracle
+
+#The deadline (and the coordinator of a parallel search) is checked every DEADLINE_CHECK_INTERVAL nodes explored
+DEADLINE_CHECK_INTERVAL = 4096
+
+TRY_TAKE = 0
+TRY_SKIP = 1
+EXHAUSTED = 2
+
+class ArrayBranchAndBound:
+
+    #Items must be sorted by value per weight in decreasing order
+    #An optional BoundCache memoizes the bound queries
+    def __init__(self,items,capacity,boundCache=None):
+        self.items = items
+        self.capacity = capacity
+        self.size = len(items)
+        self.values = [item.value for item in items]
+        self.weights = [item.weight for item in items]
+        self.boundOracle = BoundOracle(items)
+        if boundCache is not None:
+            self.boundOracle = boundCache
+        self.explored = 0
+        self.expanded = 0
+        self.optimal = False
+
+    #Returns the best value found and the original indexes of the items taken
+    #With an incumbent only strictly better solutions are searched for, and None is returned as the items when none exists
+    #The search stops at the deadline (time.time() based) with optimal set to False, and every new best solution is given to the callback
+    #A prefix of take(1)/skip(0) decisions restricts the search to that subtree. A coordinator shares the incumbent between
+    #parallel searches: getIncumbent() raises the pruning value, and when wantsWork() the shallowest open skip branch is handed to donate(prefix)
+    def optimize(self,incumbentValue=0,deadline=None,callback=None,prefix=b'',coordinator=None):
+        size = self.size
+        values = self.values
+        weights = self.weights
+        getBound = self.boundOracle.getBound
+
+        #Parallel arrays indexed by level: state of the node at that level and which branch is tried next
+        valueStack = [0]*(size+1)
+        capacityStack = [0]*(size+1)
+        branchStack = bytearray(size+1)
+        taken = bytearray(size)
+
+        bestValue = incumbentValue
+        bestTaken = bytes(0) if incumbentValue <= 0 else None
+        explored = 0
+        expanded = 0
+
+        startLevel = len(prefix)
+        taken[:startLevel] = prefix
+        valueStack[startLevel] = sum(values[i] for i in range(startLevel) if prefix[i])
+        capacityStack[startLevel] = self.capacity - sum(weights[i] for i in range(startLevel) if prefix[i])
+        branchStack[startLevel] = TRY_TAKE
+        level = startLevel
+        timedOut = False
+        if capacityStack[startLevel] < 0:
+            level = startLevel - 1
+
+        while level >= startLevel:
+            branch = branchStack[level]
+            if branch == TRY_TAKE:
+                #First visit of the node at this level
+                explored += 1
+                if explored % DEADLINE_CHECK_INTERVAL == 0:
+                    if deadline is not None and time.time() >= deadline:
+                        timedOut = True
+                        break
+                    if coordinator is not None:
+                        sharedValue = coordinator.getIncumbent()
+                        #A better solution found by another search: prune against it, nothing local beats it yet
+                        if sharedValue > bestValue:
+                            bestValue = sharedValue
+                            bestTaken = None
+                        if coordinator.wantsWork():
+                            for openLevel in range(startLevel,level):
+                                if branchStack[openLevel] == TRY_SKIP:
+                                    branchStack[openLevel] = EXHAUSTED
+                                    coordinator.donate(bytes(taken[:openLevel]) + b'\x00')
+                                    break
+                value = valueStack[level]
+                capacity = capacityStack[level]
+                #Every node is a feasible solution: the items below it are simply left out
+                if value > bestValue:
+                    bestValue = value
+                    bestTaken = bytes(taken[:level])
+                    if callback is not None:
+                        callback(bestValue,self.getTakenIndexes(bestTaken))
+                if level == size or value + getBound(level,capacity) <= bestValue:
+                    level -= 1
+                    continue
+
+                branchStack[level] = TRY_SKIP
+                if weights[level] <= capacity:
+                    taken[level] = 1
+                    level += 1
+                    valueStack[level] = value + values[level-1]
+                    capacityStack[level] = capacity - weights[level-1]
+                    branchStack[level] = TRY_TAKE
+                    expanded += 1
+                    continue
+                branch = TRY_SKIP
+
+            if branch == TRY_SKIP:
+                branchStack[level] = EXHAUSTED
+                taken[level] = 0
+                level += 1
+                valueStack[level] = valueStack[level-1]
+                capacityStack[level] = capacityStack[level-1]
+                branchStack[level] = TRY_TAKE
+                expanded += 1
+                continue
+
+            level -= 1
+
+        self.explored = explored
+        self.expanded = expanded
+        self.optimal = not timedOut
+        if bestTaken is None:
+            return bestValue,None
+        return bestValue,self.getTakenIndexes(bestTaken)
+
+    #Original indexes of the items set in the decision prefix
+    def getTakenIndexes(self,taken):
+        return [self.items[i].index for i in range(len(taken)) if taken[i]]
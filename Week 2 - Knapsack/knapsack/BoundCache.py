@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+#   Bounded memoization of the relaxation bound keyed by (level, remaining capacity)
+#   Least recently used entries are evicted once the cache is full
+class BoundCache:
+
+    def __init__(self,boundOracle,maxSize):
+        self.boundOracle = boundOracle
+        self.maxSize = maxSize
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #Same interface as BoundOracle.getBound so it can replace the oracle transparently
+    def getBound(self,level,capacity):
+        key = (level,capacity)
+        table = self.table
+        value = table.get(key)
+        if value is not None:
+            self.hits += 1
+            table.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.boundOracle.getBound(level,capacity)
+        table[key] = value
+        if len(table) > self.maxSize:
+            table.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def getHitRatio(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return float(self.hits)/float(lookups)
+
+    def getStatistics(self):
+        return "Cache Hits {}, Cache Misses {}, Evictions {}, Hit Ratio {:.2%}".format(self.hits,self.misses,self.evictions,self.getHitRatio())
+
+    def Clear(self):
+        self.table.clear()
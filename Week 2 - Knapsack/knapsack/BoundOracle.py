@@ -0,0 +1,34 @@
+from bisect import bisect_right
+
+#   Answers the linear relaxation bound of the items from a level onwards in O(log n)
+#   Items must be sorted by value per weight in decreasing order
+class BoundOracle:
+
+    def __init__(self,items):
+        self.size = len(items)
+        self.values = [item.value for item in items]
+        self.weights = [item.weight for item in items]
+        #prefixWeights[i] and prefixValues[i] hold the sums of the first i items
+        self.prefixWeights = [0]*(self.size+1)
+        self.prefixValues = [0]*(self.size+1)
+        for i in range(self.size):
+            self.prefixWeights[i+1] = self.prefixWeights[i] + self.weights[i]
+            self.prefixValues[i+1] = self.prefixValues[i] + self.values[i]
+
+    #Get the bound for the relaxed problem of the items from level onwards
+    def getBound(self,level,capacity):
+        size = self.size
+        if level >= size or capacity <= 0:
+            return 0
+        prefixWeights = self.prefixWeights
+        prefixValues = self.prefixValues
+        start = prefixWeights[level]
+        #Last position the greedy reaches taking whole items: the break item is the one at that position
+        breakItem = bisect_right(prefixWeights,start+capacity,level) - 1
+        value = prefixValues[breakItem] - prefixValues[level]
+        if breakItem < size:
+            remaining = start + capacity - prefixWeights[breakItem]
+            if remaining > 0:
+                value += (remaining/self.weights[breakItem]) * self.values[breakItem]
+
+        return value
@@ -0,0 +1,54 @@
+import time
+import numpy as np
+
+#   Dynamic Programming over a single rolling capacity array
+#   Each item updates the whole capacity row at once with NumPy and the take/skip decisions
+#   are kept as a bit packed matrix (one bit per item and capacity) for the traceback
+class DynamicProgramming:
+
+    def __init__(self,items,capacity):
+        self.items = items
+        self.capacity = capacity
+        self.size = len(items)
+        self.optimal = False
+
+    #Number of bytes the packed decision matrix needs
+    @staticmethod
+    def getDecisionMatrixBytes(itemCount,capacity):
+        return itemCount * ((capacity + 8) // 8)
+
+    #Returns the optimal value and the original indexes of the items taken
+    #The table cannot give a solution before it is complete, so past the deadline it stops and returns None as the items
+    def optimize(self,deadline=None):
+        capacity = self.capacity
+        rowBytes = (capacity + 8) // 8
+        best = np.zeros(capacity+1,dtype=np.int64)
+        decisions = np.zeros((self.size,rowBytes),dtype=np.uint8)
+
+        for i in range(self.size):
+            if deadline is not None and time.time() >= deadline:
+                return 0,None
+            value = self.items[i].value
+            weight = self.items[i].weight
+            if weight > capacity:
+                continue
+            #Row i keeps the decision for capacities weight..capacity, bit 0 is capacity == weight
+            candidate = best[:capacity+1-weight] + value
+            take = candidate > best[weight:]
+            best[weight:] = np.where(take,candidate,best[weight:])
+            packed = np.packbits(take)
+            decisions[i,:packed.shape[0]] = packed
+
+        takenIndexes = []
+        remaining = capacity
+        for i in range(self.size-1,-1,-1):
+            weight = self.items[i].weight
+            if remaining < weight:
+                continue
+            bit = remaining - weight
+            if (decisions[i,bit >> 3] >> (7 - (bit & 7))) & 1:
+                takenIndexes.append(self.items[i].index)
+                remaining -= weight
+
+        self.optimal = True
+        return int(best[capacity]),takenIndexes
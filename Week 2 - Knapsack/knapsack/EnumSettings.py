@@ -0,0 +1,9 @@
+from enum import Enum
+
+#   Enum to choose the search engine used by solve_it
+class Engine(Enum):
+    Auto = "Chosen from the instance dimensions"
+    Object = "Object Nodes"
+    Array = "Preallocated Arrays"
+    DynamicProgramming = "Dynamic Programming"
+    Parallel = "Parallel Branch and Bound"
@@ -0,0 +1,181 @@
+#Branch and Bound split over worker processes
+#The tree is cut at a fixed depth into subproblems given by a prefix of take/skip decisions. Workers pull the subproblems
+#from a shared queue and prune against an incumbent value kept in shared memory. When a worker goes idle and the queue is empty,
+#the busy workers donate the shallowest open branch of their own subtree, so the work is rebalanced until the tree is exhausted
+import multiprocessing
+import time
+try:
+    import Queue as Q  # ver. < 3.0
+except ImportError:
+    import queue as Q
+
+from ArrayBranchAndBound import ArrayBranchAndBound
+from BoundOracle import BoundOracle
+
+#Number of subproblems created per worker before the search starts
+TASKS_PER_WORKER = 8
+
+#Seconds the workers are given to exit before they are terminated
+JOIN_TIMEOUT = 1.0
+
+#   View of the shared state used by a worker search
+class Coordinator:
+
+    def __init__(self,incumbent,idle,queued,pending,tasks):
+        self.incumbent = incumbent
+        self.idle = idle
+        self.queued = queued
+        self.pending = pending
+        self.tasks = tasks
+        self.donated = 0
+
+    def getIncumbent(self):
+        return self.incumbent.value
+
+    #Keep the largest value seen by any worker
+    def publish(self,value):
+        with self.incumbent.get_lock():
+            if value > self.incumbent.value:
+                self.incumbent.value = value
+
+    def wantsWork(self):
+        return self.idle.value > 0 and self.queued.value == 0
+
+    def donate(self,prefix):
+        with self.pending.get_lock():
+            self.pending.value += 1
+        with self.queued.get_lock():
+            self.queued.value += 1
+        self.tasks.put(prefix)
+        self.donated += 1
+
+#Worker loop: solve subproblems until the sentinel arrives, reporting improving solutions on the results queue
+#Every improvement is published as soon as it is found, so the other workers prune against it while this subtree is still open
+#The done record is always sent, flagged as failed when the worker stops on an error
+def work(items,capacity,deadline,incumbent,idle,queued,pending,tasks,results):
+    coordinator = Coordinator(incumbent,idle,queued,pending,tasks)
+    search = ArrayBranchAndBound(items,capacity)
+
+    def report(value,solutionItems):
+        coordinator.publish(value)
+        results.put((value,solutionItems))
+
+    timedOut = False
+    failed = True
+    solved = 0
+    try:
+        with idle.get_lock():
+            idle.value += 1
+        while True:
+            prefix = tasks.get()
+            if prefix is None:
+                break
+            with idle.get_lock():
+                idle.value -= 1
+            with queued.get_lock():
+                queued.value -= 1
+            if not timedOut:
+                search.optimize(coordinator.getIncumbent(),deadline,report,prefix,coordinator)
+                timedOut = not search.optimal
+                solved += 1
+            with idle.get_lock():
+                idle.value += 1
+            with pending.get_lock():
+                pending.value -= 1
+        failed = False
+    finally:
+        results.put(("done",solved,coordinator.donated,timedOut,failed))
+
+class ParallelBranchAndBound:
+
+    #Items must be sorted by value per weight in decreasing order
+    def __init__(self,items,capacity,workers=None):
+        self.items = items
+        self.capacity = capacity
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.optimal = False
+        self.subproblems = 0
+        self.donated = 0
+
+    #Expand the decision prefixes level by level, dropping infeasible and pruned ones, until there are enough subproblems
+    def split(self,incumbentValue):
+        bound = BoundOracle(self.items)
+        target = self.workers * TASKS_PER_WORKER
+        prefixes = [(b'',0,self.capacity)]
+        level = 0
+        while len(prefixes) < target and level < len(self.items):
+            item = self.items[level]
+            expanded = []
+            for prefix,value,capacity in prefixes:
+                if item.weight <= capacity:
+                    expanded.append((prefix + b'\x01',value + item.value,capacity - item.weight))
+                expanded.append((prefix + b'\x00',value,capacity))
+            level += 1
+            prefixes = [entry for entry in expanded if entry[1] + bound.getBound(level,entry[2]) > incumbentValue]
+        return [prefix for prefix,_,_ in prefixes]
+
+    #Returns the best value found and the original indexes of the items taken, None when nothing beats the incumbent
+    #The callback receives every improving solution as the workers report it
+    #The search is not optimal when the deadline passes or a worker fails or dies: the subproblems it held are lost,
+    #so the remaining workers are stopped and only the solutions reported so far are kept
+    def optimize(self,incumbentValue=0,deadline=None,callback=None):
+        prefixes = self.split(incumbentValue)
+        self.subproblems = len(prefixes)
+        incumbent = multiprocessing.Value('q',incumbentValue)
+        idle = multiprocessing.Value('i',0)
+        queued = multiprocessing.Value('i',len(prefixes))
+        pending = multiprocessing.Value('i',len(prefixes))
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        for prefix in prefixes:
+            tasks.put(prefix)
+
+        processes = [multiprocessing.Process(target=work,args=(self.items,self.capacity,deadline,incumbent,idle,queued,pending,tasks,results))
+                     for _ in range(min(self.workers,max(1,len(prefixes))))]
+        for process in processes:
+            process.start()
+
+        bestValue = incumbentValue
+        bestItems = None
+        finished = 0
+        timedOut = False
+        stopping = False
+        while finished < len(processes):
+            if deadline is not None and time.time() >= deadline:
+                timedOut = True
+                break
+            #Once every subproblem is done, the sentinels let the workers exit
+            if not stopping and (pending.value == 0 or timedOut):
+                for _ in processes:
+                    tasks.put(None)
+                stopping = True
+            try:
+                result = results.get(timeout=0.05)
+            except Q.Empty:
+                #A worker killed before sending its done record
+                if any(process.exitcode not in (None,0) for process in processes):
+                    timedOut = True
+                if all(not process.is_alive() for process in processes):
+                    break
+                continue
+            if result[0] == "done":
+                finished += 1
+                self.donated += result[2]
+                timedOut = timedOut or result[3] or result[4]
+                continue
+            value,solutionItems = result
+            if value > bestValue:
+                bestValue,bestItems = value,solutionItems
+                if callback is not None:
+                    callback(bestValue,bestItems)
+
+        if not stopping:
+            for _ in processes:
+                tasks.put(None)
+        for process in processes:
+            process.join(JOIN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.optimal = not timedOut
+        return bestValue,bestItems
@@ -0,0 +1,200 @@
+import math
+from bisect import bisect_right
+
+#Number of items on each side of the break item considered by the 2-swap moves
+SWAP_WINDOW = 30
+
+#   Reductions applied before the search: dominance, fixing by reduced cost and core extraction
+#   Every method expects the items sorted by value per weight in decreasing order and keeps that order
+class Preprocessing:
+
+    #Get the greedy solution by value per weight, skipping the items that do not fit
+    @staticmethod
+    def getGreedySolution(items,capacity):
+        value = 0
+        taken = []
+        for item in items:
+            if item.weight <= capacity:
+                capacity -= item.weight
+                value += item.value
+                taken.append(item.index)
+        return value,taken
+
+    #Get the best single item that fits
+    @staticmethod
+    def getBestSingleItem(items,capacity):
+        best = None
+        for item in items:
+            if item.weight <= capacity and (best is None or item.value > best.value):
+                best = item
+        if best is None:
+            return 0,[]
+        return best.value,[best.index]
+
+    #Incumbent used to seed the search: the best of the greedy and the best single item, improved by swaps
+    @staticmethod
+    def getInitialSolution(items,capacity):
+        value,taken = Preprocessing.getGreedySolution(items,capacity)
+        singleValue,singleTaken = Preprocessing.getBestSingleItem(items,capacity)
+        if singleValue > value:
+            value,taken = singleValue,singleTaken
+        return Preprocessing.improveBySwaps(items,capacity,taken)
+
+    #Local search over the taken items until no move improves the solution:
+    #add an item that fits, swap one taken item for one left out (1-swap) and, around the break item,
+    #swap one taken item for two left out or two taken items for one left out (2-swap)
+    @staticmethod
+    def improveBySwaps(items,capacity,taken):
+        byIndex = {item.index: item for item in items}
+        taken = set(taken)
+        residual = capacity - sum(byIndex[index].weight for index in taken)
+        improved = True
+        while improved:
+            improved = False
+            #Left out items sorted by weight with the best value among the lighter ones, to answer 1-swaps with a bisect
+            outside = sorted((item for item in items if item.index not in taken),key=lambda x: x.weight)
+            outsideWeights = [item.weight for item in outside]
+            bestLighter = []
+            for item in outside:
+                if not bestLighter or item.value > bestLighter[-1].value:
+                    bestLighter.append(item)
+                else:
+                    bestLighter.append(bestLighter[-1])
+
+            position = bisect_right(outsideWeights,residual) - 1
+            if position >= 0:
+                item = bestLighter[position]
+                taken.add(item.index)
+                residual -= item.weight
+                improved = True
+                continue
+
+            bestGain = 0
+            bestMove = None
+            for index in taken:
+                item = byIndex[index]
+                position = bisect_right(outsideWeights,residual + item.weight) - 1
+                if position >= 0 and bestLighter[position].value - item.value > bestGain:
+                    bestGain = bestLighter[position].value - item.value
+                    bestMove = ([item],[bestLighter[position]])
+
+            if bestMove is None:
+                bestMove = Preprocessing.getBestTwoSwap(items,capacity,taken,residual)
+            if bestMove is not None:
+                removed,added = bestMove
+                for item in removed:
+                    taken.discard(item.index)
+                    residual += item.weight
+                for item in added:
+                    taken.add(item.index)
+                    residual -= item.weight
+                improved = True
+
+        value = sum(byIndex[index].value for index in taken)
+        return value,sorted(taken)
+
+    #Best improving move exchanging one item for two or two items for one, among the items close to the break item
+    @staticmethod
+    def getBestTwoSwap(items,capacity,taken,residual):
+        breakItem,_,_ = Preprocessing.getBreakItem(items,capacity)
+        window = items[max(0,breakItem - SWAP_WINDOW):breakItem + SWAP_WINDOW]
+        inside = [item for item in window if item.index in taken]
+        outside = [item for item in window if item.index not in taken]
+        bestGain = 0
+        bestMove = None
+        for first in range(len(outside)):
+            for second in range(first+1,len(outside)):
+                pairWeight = outside[first].weight + outside[second].weight
+                pairValue = outside[first].value + outside[second].value
+                for item in inside:
+                    if pairWeight <= residual + item.weight and pairValue - item.value > bestGain:
+                        bestGain = pairValue - item.value
+                        bestMove = ([item],[outside[first],outside[second]])
+        for first in range(len(inside)):
+            for second in range(first+1,len(inside)):
+                pairWeight = inside[first].weight + inside[second].weight
+                pairValue = inside[first].value + inside[second].value
+                for item in outside:
+                    if item.weight <= residual + pairWeight and item.value - pairValue > bestGain:
+                        bestGain = item.value - pairValue
+                        bestMove = ([inside[first],inside[second]],[item])
+        return bestMove
+
+    #Return the position of the break item (first item that does not fit whole), the linear relaxation bound and the critical ratio
+    #When every item fits the break item is len(items) and the ratio is zero
+    @staticmethod
+    def getBreakItem(items,capacity):
+        weight = 0
+        value = 0
+        for position in range(len(items)):
+            item = items[position]
+            if weight + item.weight > capacity:
+                ratio = float(item.value)/float(item.weight)
+                return position,value + (capacity - weight) * ratio,ratio
+            weight += item.weight
+            value += item.value
+        return len(items),value,0.0
+
+    #Remove items that an optimal solution never needs
+    #An item j is dominated by i when w_i <= w_j and v_i >= v_j (ties broken by position). Some optimal solution that takes j
+    #also takes every item dominating it, so j is left out when its weight plus the weight of its dominators exceeds the capacity.
+    #The dominator weights are summed with a Fenwick tree over the value ranks in O(n log n)
+    @staticmethod
+    def removeDominated(items,capacity):
+        size = len(items)
+        order = sorted(range(size),key=lambda i: (items[i].weight,-items[i].value,i))
+        ranks = {value: rank for rank,value in enumerate(sorted(set(item.value for item in items),reverse=True))}
+        tree = [0]*(len(ranks)+1)
+        removed = set()
+        for position in order:
+            item = items[position]
+            rank = ranks[item.value] + 1
+            #Sum of the weights already inserted with value >= item.value
+            dominatorWeight = 0
+            i = rank
+            while i > 0:
+                dominatorWeight += tree[i]
+                i -= i & (-i)
+            if item.weight > capacity or item.weight + dominatorWeight > capacity:
+                removed.add(position)
+            i = rank
+            while i < len(tree):
+                tree[i] += item.weight
+                i += i & (-i)
+
+        kept = [items[i] for i in range(size) if i not in removed]
+        return kept,len(removed)
+
+    #Fix the variables whose opposite value cannot beat the incumbent according to the Dantzig bound
+    #Returns the items fixed in, the items fixed out and the free items
+    @staticmethod
+    def fixByReducedCost(items,capacity,incumbentValue):
+        breakItem,bound,ratio = Preprocessing.getBreakItem(items,capacity)
+        fixedIn = []
+        fixedOut = []
+        free = []
+        for position in range(len(items)):
+            item = items[position]
+            if position != breakItem and Preprocessing.isFixable(item,bound,ratio,incumbentValue):
+                if position < breakItem:
+                    fixedIn.append(item)
+                else:
+                    fixedOut.append(item)
+            else:
+                free.append(item)
+        return fixedIn,fixedOut,free
+
+    #Whether flipping the item against its linear relaxation value gives a bound that cannot improve on the incumbent
+    @staticmethod
+    def isFixable(item,bound,ratio,incumbentValue):
+        reducedCost = math.fabs(item.value - ratio * item.weight)
+        return math.floor(bound - reducedCost + 1.e-9) <= incumbentValue
+
+    #Split the items in those before the core (taken), the core around the break item and those after it (left out)
+    @staticmethod
+    def getCore(items,capacity,coreSize):
+        breakItem,_,_ = Preprocessing.getBreakItem(items,capacity)
+        start = max(0,breakItem - coreSize//2)
+        end = min(len(items),start + coreSize)
+        start = max(0,end - coreSize)
+        return items[:start],items[start:end],items[end:]
@@ -0,0 +1,20 @@
+from collections import namedtuple
+
+Item = namedtuple("Item", ['index', 'value', 'weight','value_per_weight'])
+
+#   Parse the instance in a single pass over its tokens
+class Reader:
+
+    #Returns the capacity and the items sorted by value per weight in decreasing order
+    @staticmethod
+    def readItems(input_data):
+        tokens = input_data.split()
+        item_count = int(tokens[0])
+        capacity = int(tokens[1])
+        values = list(map(int,tokens[2:2+2*item_count:2]))
+        weights = list(map(int,tokens[3:3+2*item_count:2]))
+        items = [Item(i,values[i],weights[i],float(values[i])/float(weights[i])) for i in range(item_count)]
+        #Sort Items by value per weight in decreasing order
+        #Must sort to calcualte the upper bound solution
+        items.sort(key=lambda x: x.value_per_weight, reverse=True)
+        return capacity,items
@@ -13,12 +13,56 @@ public class Solver {
      */
     public static void main(String[] args) {
         try {
-            solve(args);
+            if(hasArgument(args, "-worker")){
+                serve(System.in, System.out);
+            } else {
+                solve(args);
+            }
         } catch (IOException e) {
             e.printStackTrace();
         }
     }
-    
+
+    /**
+     * Whether the argument was given in the command line
+     */
+    private static boolean hasArgument(String[] args, String name) {
+        for(String arg : args){
+            if(arg.equals(name)){
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * Keep the JVM alive and solve every instance written to the input stream.
+     * The instances are self delimited: the first line holds the number of items, followed by one line per item.
+     * Each solution is flushed as soon as it is ready so the caller can read it back.
+     */
+    public static void serve(InputStream in, PrintStream out) throws IOException {
+        BufferedReader input = new BufferedReader(new InputStreamReader(in));
+        String header;
+        while((header = input.readLine()) != null){
+            header = header.trim();
+            if(header.isEmpty()){
+                continue;
+            }
+            List<String> lines = new ArrayList<String>();
+            lines.add(header);
+            int items = Integer.parseInt(header.split("\\s+")[0]);
+            for(int i=0; i < items; i++){
+                String line = input.readLine();
+                if(line == null){
+                    return;
+                }
+                lines.add(line.trim());
+            }
+            solve(lines, out);
+            out.flush();
+        }
+    }
+
     /**
      * Read the instance, solve it, and print the solution in the standard output
      */
@@ -48,7 +92,13 @@ public class Solver {
             input.close();
         }
         
-        
+        solve(lines, System.out);
+    }
+
+    /**
+     * Solve the instance given by its lines and print the solution to the output stream
+     */
+    public static void solve(List<String> lines, PrintStream out) {
         // parse the data in the file
         String[] firstLine = lines.get(0).split("\\s+");
         int items = Integer.parseInt(firstLine[0]);
@@ -82,10 +132,10 @@ public class Solver {
         }
         
         // prepare the solution in the specified output format
-        System.out.println(value+" 0");
+        out.println(value+" 0");
         for(int i=0; i < items; i++){
-            System.out.print(taken[i]+" ");
+            out.print(taken[i]+" ");
         }
-        System.out.println("");        
+        out.println("");        
     }
 }
\ No newline at end of file
@@ -0,0 +1,33 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Report the nodes explored and expanded by the array Branch and Bound with and without the initial incumbent
+
+import time
+from Reader import Reader
+from Preprocessing import Preprocessing
+from ArrayBranchAndBound import ArrayBranchAndBound
+
+def benchmark(file_location):
+    with open(file_location, 'r') as input_data_file:
+        input_data = input_data_file.read()
+    capacity,items = Reader.readItems(input_data)
+    incumbentValue,_ = Preprocessing.getInitialSolution(items,capacity)
+    results = []
+    for seed in [0,incumbentValue]:
+        search = ArrayBranchAndBound(items,capacity)
+        start = time.perf_counter()
+        search.optimize(seed)
+        results.append((search.explored,search.expanded,time.perf_counter()-start))
+    return incumbentValue,results
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1:
+        print("{:<20} {:>10} {:>28} {:>28}".format("Instance","Incumbent","Without (expl/exp/s)","With (expl/exp/s)"))
+        for file_location in sys.argv[1:]:
+            incumbentValue,results = benchmark(file_location.strip())
+            columns = ["{}/{}/{:.2f}".format(*result) for result in results]
+            print("{:<20} {:>10} {:>28} {:>28}".format(file_location.strip(),incumbentValue,*columns))
+    else:
+        print('This benchmark requires input files.  Please select them from the data directory. (i.e. python benchmark_incumbent.py ./data/ks_1000_0 ./data/ks_10000_0)')
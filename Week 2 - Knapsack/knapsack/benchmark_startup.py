@@ -0,0 +1,33 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Report the parse and setup latency (sorting and bound index) of every instance in the data directory
+
+import os
+import time
+from Reader import Reader
+from BoundOracle import BoundOracle
+
+def benchmark(file_location,repetitions):
+    with open(file_location, 'r') as input_data_file:
+        input_data = input_data_file.read()
+    parseTime = 0.0
+    setupTime = 0.0
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        capacity,items = Reader.readItems(input_data)
+        parsed = time.perf_counter()
+        BoundOracle(items)
+        end = time.perf_counter()
+        parseTime += parsed - start
+        setupTime += end - parsed
+    return len(items),parseTime/repetitions,setupTime/repetitions
+
+if __name__ == '__main__':
+    import sys
+    directory = sys.argv[1].strip() if len(sys.argv) > 1 else './data'
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print("{:<20} {:>8} {:>12} {:>12}".format("Instance","Items","Parse (ms)","Setup (ms)"))
+    for name in sorted(os.listdir(directory)):
+        count,parseTime,setupTime = benchmark(os.path.join(directory,name),repetitions)
+        print("{:<20} {:>8} {:>12.3f} {:>12.3f}".format(name,count,parseTime*1000,setupTime*1000))
@@ -4,16 +4,25 @@
 #Branch and Bound using Depth First Search Approach
 
 #Grade 10/10 without memoization
-#Todo Fix Memoization
-from collections import namedtuple
 try:
     import Queue as Q  # ver. < 3.0
 except ImportError:
     import queue as Q
 
 import gc
+import time
+from Reader import Reader
+from BoundOracle import BoundOracle
+from BoundCache import BoundCache
+from Preprocessing import Preprocessing
+from EnumSettings import Engine
+from ArrayBranchAndBound import ArrayBranchAndBound, DEADLINE_CHECK_INTERVAL
+from ParallelBranchAndBound import ParallelBranchAndBound
+try:
+    from DynamicProgramming import DynamicProgramming
+except ImportError:
+    DynamicProgramming = None  # NumPy not available
 
-Item = namedtuple("Item", ['index', 'value', 'weight','value_per_weight'])
 #Node = namedtuple("Node", ['current_value', 'current_estimative','remaining_capacity', 'parent','level','item','left_tree','right_tree'])
 
 class Node:
@@ -30,60 +39,147 @@ class Node:
         otherPriority = (other.current_estimative,other.level)
         return selfPriority < otherPriority
 
-class MemoizationTable:
-    def __init__(self):
-        self.size = 0
-    def GetValue(self,position):
-        if(position >= self.size):
-            return None
-        return self.table[position]
-    def SetValue(self,value,position):
-        if(position < self.size):
-            self.table[position] = value
-    def CreateTable(self,size):
-        self.table = [None]*size
-        self.size = size
-    def Clear(self):
-        del self.table
-        self.size = 0
-        gc.collect()
-
-memoTable = MemoizationTable()
-
-def solve_it(input_data):
+#Capacity aware memoization of the relaxation bound
+MEMOIZATION_SIZE = 1 << 20
+boundCache = None
+
+#Dynamic Programming is used when its packed decision matrix and capacity row stay below these limits
+#and the number of cells (items x capacity) keeps its runtime below Branch and Bound on the easy instances
+DP_MEMORY_LIMIT = 256 * 1024 * 1024
+DP_CAPACITY_LIMIT = 10000000
+DP_CELL_LIMIT = 200000000
+
+#Choose Dynamic Programming when capacity x items is tractable, Branch and Bound otherwise
+def chooseEngine(item_count,capacity):
+    if DynamicProgramming is None:
+        return Engine.Array
+    if capacity > DP_CAPACITY_LIMIT:
+        return Engine.Array
+    if DynamicProgramming.getDecisionMatrixBytes(item_count,capacity) > DP_MEMORY_LIMIT:
+        return Engine.Array
+    if item_count * capacity > DP_CELL_LIMIT:
+        return Engine.Array
+    return Engine.DynamicProgramming
+
+#Worker processes used by the parallel engine, None for one per CPU
+PARALLEL_WORKERS = None
+
+#Size of the first core extracted around the break item, doubled until the core solution is proven optimal
+CORE_SIZE = 50
+
+#Anytime solving: past the deadline (time.time() based) the best solution found so far is returned and the optimality flag is
+#set only when the search proved it. Every improving solution is given to callback(value, taken item indexes) as it is found
+def solve_it(input_data,engine=Engine.Auto,memoization=False,preprocessing=True,deadline=None,callback=None):
     # Modify this code to run your optimization algorithm
 
     # parse the input
-    lines = input_data.split('\n')
-
-    firstLine = lines[0].split()
-    item_count = int(firstLine[0])
-    capacity = int(firstLine[1])
-
-    items = []
-
-    for i in range(1, item_count+1):
-        line = lines[i]
-        parts = line.split()
-        items.append(Item(i-1, int(parts[0]), int(parts[1]),float(float(parts[0])/float(parts[1]))))
-        #Sort Items by value per weight in decreasing order
-        #Must sort to calcualte the upper bound solution
-        items.sort(key=lambda x: x.value_per_weight, reverse=True)
-    global memoTable
-    memoTable.CreateTable(len(items))
-    initialEstimative = get_bound(items,capacity)
-    best_solution = Branch_and_Bound(initialEstimative,capacity,items)
-    solutionItems = returnSolutionItems(best_solution)
+    capacity,items = Reader.readItems(input_data)
+
+    if preprocessing:
+        value,solutionItems,optimal = solve_reduced(items,capacity,engine,memoization,deadline,callback)
+    else:
+        incumbentValue,incumbentItems = Preprocessing.getInitialSolution(items,capacity)
+        print("Incumbent: {}".format(incumbentValue))
+        if callback is not None:
+            callback(incumbentValue,incumbentItems)
+        value,solutionItems,optimal = search(items,capacity,engine,memoization,incumbentValue,deadline,callback)
+        if solutionItems is None:
+            value,solutionItems = incumbentValue,incumbentItems
+    solutionItems = set(solutionItems)
     taken = [1 if i in solutionItems else 0 for i in range(len(items)) ]
-    value = best_solution.current_value
-    
+
     # prepare the solution in the specified output format
-    output_data = str(value) + ' ' + str(0) + '\n'
+    output_data = str(value) + ' ' + str(1 if optimal else 0) + '\n'
     output_data += ' '.join(map(str, taken))
-    memoTable.Clear()
     gc.collect()
     return output_data
 
+#Run one of the exact engines over the items, returns the best value, the original indexes taken and whether it is proven optimal
+#Branch and Bound prunes against the incumbent value and returns None as the items when it finds nothing better
+def search(items,capacity,engine,memoization,incumbentValue=0,deadline=None,callback=None):
+    if not items:
+        return 0,[],True
+    if engine == Engine.Auto:
+        engine = chooseEngine(len(items),capacity)
+    print("Engine: {}".format(engine.value))
+
+    global boundCache
+    #The object engine always memoizes the bound, the array engine only when asked to
+    if engine == Engine.Object or (engine == Engine.Array and memoization):
+        boundCache = BoundCache(BoundOracle(items),MEMOIZATION_SIZE)
+    if engine == Engine.DynamicProgramming:
+        dynamicProgramming = DynamicProgramming(items,capacity)
+        value,solutionItems = dynamicProgramming.optimize(deadline)
+        optimal = dynamicProgramming.optimal
+        if solutionItems is not None and callback is not None and value > incumbentValue:
+            callback(value,solutionItems)
+    elif engine == Engine.Parallel:
+        parallelSearch = ParallelBranchAndBound(items,capacity,PARALLEL_WORKERS)
+        value,solutionItems = parallelSearch.optimize(incumbentValue,deadline,callback)
+        optimal = parallelSearch.optimal
+        print("Subproblems {}, Donated {}, Workers {}".format(parallelSearch.subproblems,parallelSearch.donated,parallelSearch.workers))
+    elif engine == Engine.Array:
+        arraySearch = ArrayBranchAndBound(items,capacity,boundCache)
+        value,solutionItems = arraySearch.optimize(incumbentValue,deadline,callback)
+        optimal = arraySearch.optimal
+        print("Nodes Explored {}, Nodes Expanded {}".format(arraySearch.explored,arraySearch.expanded))
+    else:
+        initialEstimative = get_bound(items,capacity)
+        best_solution,optimal = Branch_and_Bound(initialEstimative,capacity,items,incumbentValue,deadline,callback)
+        value = best_solution.current_value
+        solutionItems = None if best_solution.level < -1 else returnSolutionItems(best_solution)
+    if boundCache is not None:
+        print(boundCache.getStatistics())
+        boundCache.Clear()
+        boundCache = None
+    return value,solutionItems,optimal
+
+#Reduce the problem before searching: drop dominated items, fix variables by reduced cost against the greedy solution
+#and search only a core around the break item, growing it until every item outside is fixed by reduced cost
+def solve_reduced(items,capacity,engine,memoization,deadline=None,callback=None):
+    items,dominated = Preprocessing.removeDominated(items,capacity)
+    incumbentValue,incumbentItems = Preprocessing.getInitialSolution(items,capacity)
+    if callback is not None:
+        callback(incumbentValue,incumbentItems)
+    fixedIn,fixedOut,free = Preprocessing.fixByReducedCost(items,capacity,incumbentValue)
+    freeCapacity = capacity - sum(item.weight for item in fixedIn)
+    print("Preprocessing: {} dominated, {} fixed in, {} fixed out, {} free items, incumbent {}".format(dominated,len(fixedIn),len(fixedOut),len(free),incumbentValue))
+
+    fixedValue = sum(item.value for item in fixedIn)
+    fixedItems = [item.index for item in fixedIn]
+    coreSize = CORE_SIZE
+    optimal = False
+    while True:
+        #A core close to the size of the free items is not worth a second search
+        if len(free) <= 2*coreSize:
+            coreSize = len(free)
+        before,core,after = Preprocessing.getCore(free,freeCapacity,coreSize)
+        coreCapacity = freeCapacity - sum(item.weight for item in before)
+        outsideValue = fixedValue + sum(item.value for item in before)
+        outsideItems = fixedItems + [item.index for item in before]
+        coreCallback = None
+        if callback is not None:
+            coreCallback = lambda value,solutionItems: callback(value + outsideValue,outsideItems + solutionItems)
+        value,solutionItems,coreOptimal = search(core,coreCapacity,engine,memoization,incumbentValue - outsideValue,deadline,coreCallback)
+        if solutionItems is not None and value + outsideValue > incumbentValue:
+            incumbentValue = value + outsideValue
+            incumbentItems = outsideItems + solutionItems
+        if not coreOptimal:
+            break
+        #The core answer is optimal once no item outside the core can be flipped to beat it
+        if not before and not after:
+            optimal = True
+            break
+        _,bound,ratio = Preprocessing.getBreakItem(free,freeCapacity)
+        bound += fixedValue
+        outside = before + after
+        if all(Preprocessing.isFixable(item,bound,ratio,incumbentValue) for item in outside):
+            optimal = True
+            break
+        coreSize *= 2
+    print("Core: {} of {} free items".format(len(core),len(free)))
+    return incumbentValue,incumbentItems,optimal
+
 def returnSolutionItems(solution):
     items=[]
     node = solution
@@ -95,27 +191,8 @@ def returnSolutionItems(solution):
 
 #Get the bound for the relaxed problem
 def get_bound(items,capacity,level=0):
-    global memoTable
-    value = memoTable.GetValue(level)
-    if(value is not None):
-        #print("Returning from Memo")
-        return value
-    #print("Returning from Function")
-    weight = 0
-    value = 0
-    i = level
-    while i < len(items) and weight + items[i].weight <= capacity:      
-        value += items[i].value
-        weight += items[i].weight
-        i+=1
-
-    if weight < capacity and i < len(items):
-        diff = capacity - weight
-        ratio = float(diff)/float(items[i].weight)
-        value += (ratio * items[i].value)
-
-    memoTable.SetValue(value,level)
-    return value
+    global boundCache
+    return boundCache.getBound(level,capacity)
 
 
 
@@ -167,16 +244,27 @@ def returnBestSolution(currentState,CurrentBest):
 
     return CurrentBest
 
-def Branch_and_Bound(initialEstimative,initialCapacity,items):
+#The incumbent is a sentinel node at level -2: it lets evaluate prune from the first node and
+#is returned as is when no better solution exists
+#Returns the best node and whether the search finished before the deadline
+def Branch_and_Bound(initialEstimative,initialCapacity,items,incumbentValue=0,deadline=None,callback=None):
     frontier =[]
     node = Node(0,initialEstimative,initialCapacity,None,-1,None)
     best_solution = node
+    if incumbentValue > 0:
+        best_solution = Node(incumbentValue,incumbentValue,0,None,-2,None)
     frontier.append(node)
     explored = 0
     expanded = 0
     while frontier:
+        if deadline is not None and explored % DEADLINE_CHECK_INTERVAL == 0 and time.time() >= deadline:
+            print("Nodes Explored {}, Nodes Expanded {}, Deadline Reached".format(explored,expanded))
+            return best_solution,False
         currentNode = frontier.pop()
+        previous_best = best_solution
         best_solution = returnBestSolution(currentNode,best_solution)
+        if callback is not None and best_solution is not previous_best:
+            callback(best_solution.current_value,returnSolutionItems(best_solution))
         explored+=1
         if(evaluate(currentNode,best_solution)):
             right = create_node(currentNode,items,False)
@@ -189,7 +277,7 @@ def Branch_and_Bound(initialEstimative,initialCapacity,items):
                 expanded+=1
 
     print("Nodes Explored {}, Nodes Expanded {}".format(explored,expanded))
-    return best_solution
+    return best_solution,True
 
 if __name__ == '__main__':
     import sys
@@ -197,7 +285,9 @@ if __name__ == '__main__':
         file_location = sys.argv[1].strip()
         with open(file_location, 'r') as input_data_file:
             input_data = input_data_file.read()
-        print(solve_it(input_data))
+        #Optional time limit in seconds
+        deadline = time.time() + float(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(solve_it(input_data,deadline=deadline))
     else:
-        print('This test requires an input file.  Please select one from the data directory. (i.e. python solver.py ./data/ks_4_0)')
+        print('This test requires an input file.  Please select one from the data directory. (i.e. python solver.py ./data/ks_4_0 [seconds])')
 
@@ -2,24 +2,91 @@
 # -*- coding: utf-8 -*-
 
 import os
+import tempfile
+import threading
+import atexit
 from subprocess import Popen, PIPE
 
-def solve_it(input_data):
+#   A Java Solver kept alive in worker mode: instances are written to its stdin and the solutions read back from its stdout,
+#   so the JVM starts once and no file is written
+class JavaWorker:
+
+    def __init__(self):
+        self.process = Popen(['java', 'Solver', '-worker'], stdin=PIPE, stdout=PIPE, universal_newlines=True, bufsize=1)
+
+    def solve(self,input_data):
+        lines = [line.strip() for line in input_data.strip().split('\n')]
+        item_count = int(lines[0].split()[0])
+        self.process.stdin.write('\n'.join(lines[:item_count+1]) + '\n')
+        self.process.stdin.flush()
+        #The solution is always two lines: the value with the optimality flag and the decision of each item
+        header = self.process.stdout.readline()
+        taken = self.process.stdout.readline()
+        if not header:
+            raise RuntimeError("Java worker exited with code {}".format(self.process.poll()))
+        return (header + taken).strip()
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+#   Warm workers shared across instances, one per instance solved at the same time
+class WorkerPool:
 
-    # Writes the inputData to a temporay file
+    def __init__(self):
+        self.idle = []
+        self.workers = []
+        self.lock = threading.Lock()
 
-    tmp_file_name = 'tmp.data'
-    tmp_file = open(tmp_file_name, 'w')
-    tmp_file.write(input_data)
-    tmp_file.close()
+    def acquire(self):
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        worker = JavaWorker()
+        with self.lock:
+            self.workers.append(worker)
+        return worker
 
-    # Runs the command: java Solver -file=tmp.data
+    def release(self,worker):
+        with self.lock:
+            self.idle.append(worker)
 
-    process = Popen(['java', 'Solver', '-file=' + tmp_file_name], stdout=PIPE)
-    (stdout, stderr) = process.communicate()
+    def close(self):
+        with self.lock:
+            for worker in self.workers:
+                worker.close()
+            self.workers = []
+            self.idle = []
 
-    # removes the temporay file
-    os.remove(tmp_file_name)
+workerPool = WorkerPool()
+atexit.register(workerPool.close)
+
+def solve_it(input_data):
+    worker = workerPool.acquire()
+    try:
+        result = worker.solve(input_data)
+    except Exception:
+        #A broken worker is not returned to the pool
+        worker.close()
+        raise
+    workerPool.release(worker)
+    return result
+
+#One JVM per call through a file, for a Solver compiled without the worker mode
+#The file name is unique so several instances can run at the same time
+def solve_it_with_file(input_data):
+    descriptor, tmp_file_name = tempfile.mkstemp(suffix='.data')
+    try:
+        with os.fdopen(descriptor, 'w') as tmp_file:
+            tmp_file.write(input_data)
+
+        # Runs the command: java Solver -file=tmp.data
+        process = Popen(['java', 'Solver', '-file=' + tmp_file_name], stdout=PIPE, universal_newlines=True)
+        (stdout, stderr) = process.communicate()
+    finally:
+        # removes the temporay file
+        os.remove(tmp_file_name)
 
     return stdout.strip()
 
@@ -28,10 +95,9 @@ import sys
 
 if __name__ == '__main__':
     if len(sys.argv) > 1:
-        file_location = sys.argv[1].strip()
-        with open(file_location, 'r') as input_data_file:
-            input_data = input_data_file.read()
-        print solve_it(input_data)
+        for file_location in sys.argv[1:]:
+            with open(file_location.strip(), 'r') as input_data_file:
+                input_data = input_data_file.read()
+            print(solve_it(input_data))
     else:
         print('This test requires an input file.  Please select one from the data directory. (i.e. python solver.py ./data/ks_4_0)')
-
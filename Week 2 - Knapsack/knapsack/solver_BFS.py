@@ -2,118 +2,53 @@
 # -*- coding: utf-8 -*-
 #Branch and Bound using Best First Search Approach
 
-#Todo Fix Memoization
-from collections import namedtuple
-try:
-    import Queue as Q  # ver. < 3.0
-except ImportError:
-    import queue as Q
+from heapq import heappush, heappop
 
 import gc
+from Reader import Reader
+from BoundOracle import BoundOracle
+from BoundCache import BoundCache
 
-Item = namedtuple("Item", ['index', 'value', 'weight','value_per_weight'])
-
-
-class Node:
-    def __init__(self, current_value, current_estimative,remaining_capacity,parent,level,item):
-        self.current_value = current_value
-        self.current_estimative = current_estimative
-        self.remaining_capacity = remaining_capacity
-        self.parent = parent
-        self.level = level
-        self.item = item
-
-    def __lt__(self, other):
-        selfPriority = (self.current_estimative,self.level)
-        otherPriority = (other.current_estimative,other.level)
-        return selfPriority < otherPriority
-
-class MemoizationTable:
-    def __init__(self):
-        self.size = 0
-    def GetValue(self,position):
-        if(position >= self.size):
-            return None
-        return self.table[position]
-    def SetValue(self,value,position):
-        if(position < self.size):
-            self.table[position] = value
-    def CreateTable(self,size):
-        self.table = [None]*size
-        self.size = size
-    def Clear(self):
-        del self.table
-        self.size = 0
-        gc.collect()
-
-memoTable = MemoizationTable()
-
-def solve_it(input_data):
+#Capacity aware memoization of the relaxation bound
+MEMOIZATION_SIZE = 1 << 20
+boundCache = None
+
+#Maximum number of open nodes kept by the best first frontier, past that the search dives depth first
+FRONTIER_LIMIT = 1000000
+
+def solve_it(input_data,frontierLimit=FRONTIER_LIMIT):
     # Modify this code to run your optimization algorithm
 
     # parse the input
-    lines = input_data.split('\n')
-
-    firstLine = lines[0].split()
-    item_count = int(firstLine[0])
-    capacity = int(firstLine[1])
-
-    items = []
-
-    for i in range(1, item_count+1):
-        line = lines[i]
-        parts = line.split()
-        items.append(Item(i-1, int(parts[0]), int(parts[1]),float(float(parts[0])/float(parts[1]))))
-        #Sort Items by value per weight in decreasing order
-        #Must sort to calcualte the upper bound solution
-        items.sort(key=lambda x: x.value_per_weight, reverse=True)
-    global memoTable
-    memoTable.CreateTable(len(items))
+    capacity,items = Reader.readItems(input_data)
+    global boundCache
+    boundCache = BoundCache(BoundOracle(items),MEMOIZATION_SIZE)
     initialEstimative = get_bound(items,capacity)
-    best_solution = Branch_and_Bound(initialEstimative,capacity,items)
-    solutionItems = returnSolutionItems(best_solution)
+    value,path = Branch_and_Bound(initialEstimative,capacity,items,frontierLimit)
+    solutionItems = set(returnSolutionItems(path))
     taken = [1 if i in solutionItems else 0 for i in range(len(items)) ]
-    value = best_solution.current_value
-    
+
     # prepare the solution in the specified output format
     output_data = str(value) + ' ' + str(0) + '\n'
     output_data += ' '.join(map(str, taken))
-    memoTable.Clear()
+    print(boundCache.getStatistics())
+    boundCache.Clear()
+    boundCache = None
     gc.collect()
     return output_data
 
-def returnSolutionItems(solution):
+#The path of a node is a linked list of (item index, parent path) holding only the items taken
+def returnSolutionItems(path):
     items=[]
-    node = solution
-    while(node.parent is not None):
-        if node.item is not None:
-            items.append(node.item.index)
-        node = node.parent
+    while(path is not None):
+        items.append(path[0])
+        path = path[1]
     return items
-    
+
 #Get the bound for the relaxed problem
 def get_bound(items,capacity,level=0):
-    global memoTable
-    value = memoTable.GetValue(level)
-    if(value is not None):
-        print("Returning from Memo")
-        return value
-    print("Returning from Function")
-    weight = 0
-    value = 0
-    i = level
-    while i < len(items) and weight + items[i].weight <= capacity:      
-        value += items[i].value
-        weight += items[i].weight
-        i+=1
-
-    if weight < capacity and i < len(items):
-        diff = capacity - weight
-        ratio = float(diff)/float(items[i].weight)
-        value += (ratio * items[i].value)
-
-    memoTable.SetValue(value,level)
-    return value
+    global boundCache
+    return boundCache.getBound(level,capacity)
 
 
 
@@ -123,71 +58,62 @@ def heuristic(capacity,cost,items,level):
     return bound + cost
 
 
-#Evaluate wheter the node can be expanded (put on the frontier)
-def evaluate(candidate,best_solution):
-    if candidate.remaining_capacity < 0:
-        return False
-    if candidate.current_estimative < 0:
-        return False
-    if best_solution.current_value > candidate.current_estimative:
-        return False
-    
-    return True
-
-def create_node(parent,items,include):
-    if parent.level+1 >= len(items):
-        return None
-    if include:
-        newLevel = parent.level+1
-        newCapacity = parent.remaining_capacity - items[newLevel].weight
-        if(newCapacity < 0):
-            return None
-
-        new_item = items[newLevel]
-        newValue = parent.current_value+items[newLevel].value
-        newEstimative = heuristic(newCapacity,newValue,items,newLevel+1)
-        if(newEstimative < 0):
-            return None
-    else:
-        newLevel = parent.level+1
-        newValue = parent.current_value
-        newEstimative = heuristic(parent.remaining_capacity,newValue,items,newLevel+1)
-        newCapacity = parent.remaining_capacity
-        if(newCapacity < 0 or newEstimative < 0):
-            return None
-        new_item = None
-
-    return Node(newValue,newEstimative,newCapacity,parent,newLevel,new_item)
-
-def returnBestSolution(currentState,CurrentBest):
-    if currentState.current_value  > CurrentBest.current_value:
-        return currentState
-
-    return CurrentBest
-
-def Branch_and_Bound(initialEstimative,initialCapacity,items):
-    frontier = Q.PriorityQueue()
-    node = Node(0,initialEstimative,initialCapacity,None,-1,None)
-    best_solution = node
-    frontier.put((-node.current_value,node))
+#Frontier entries are plain tuples: (-estimative, -level, insertion order, value, remaining capacity, path)
+#Level is the index of the next item to decide and the insertion order keeps ties from comparing paths
+def Branch_and_Bound(initialEstimative,initialCapacity,items,frontierLimit=FRONTIER_LIMIT):
+    size = len(items)
+    frontier = [(-initialEstimative,0,0,0,initialCapacity,None)]
+    bestValue = 0
+    bestPath = None
+    order = 1
     explored = 0
     expanded = 0
-    while not frontier.empty():
-        currentNode = frontier.get()[1]
-        best_solution = returnBestSolution(currentNode,best_solution)
-        explored+=1
-        if(evaluate(currentNode,best_solution)):
-            right = create_node(currentNode,items,False)
-            if(right is not None):
-                frontier.put((-right.current_value,right))
-                expanded+=1
-            left = create_node(currentNode,items,True)
-            if(left is not None):
-                frontier.put((-left.current_value,left))
-                expanded+=1
-
-    #print("Nodes Explored {}, Nodes Expanded {}".format(explored,expanded))
-    return best_solution
+    dives = 0
+    while frontier:
+        entry = heappop(frontier)
+        #The frontier is ordered by estimative so nothing left can beat the best solution
+        if -entry[0] <= bestValue:
+            break
+        #Past the frontier limit the node's subtree is searched depth first on a local stack instead
+        diving = len(frontier) >= frontierLimit
+        if diving:
+            dives += 1
+        stack = [entry]
+        while stack:
+            negativeEstimative,negativeLevel,_,value,capacity,path = stack.pop()
+            #The incumbent may have improved since the node was created
+            if -negativeEstimative <= bestValue:
+                continue
+            level = -negativeLevel
+            explored += 1
+            if level >= size:
+                continue
+            item = items[level]
+            children = []
+            skipEstimative = heuristic(capacity,value,items,level+1)
+            if skipEstimative > bestValue:
+                children.append((-skipEstimative,-(level+1),order,value,capacity,path))
+                order += 1
+            if item.weight <= capacity:
+                takeValue = value + item.value
+                takeCapacity = capacity - item.weight
+                takePath = (item.index,path)
+                if takeValue > bestValue:
+                    bestValue = takeValue
+                    bestPath = takePath
+                takeEstimative = heuristic(takeCapacity,takeValue,items,level+1)
+                if takeEstimative > bestValue:
+                    children.append((-takeEstimative,-(level+1),order,takeValue,takeCapacity,takePath))
+                    order += 1
+            expanded += len(children)
+            for child in children:
+                if diving:
+                    stack.append(child)
+                else:
+                    heappush(frontier,child)
+
+    print("Nodes Explored {}, Nodes Expanded {}, Dives {}".format(explored,expanded,dives))
+    return bestValue,bestPath
 
 if __name__ == '__main__':
     import sys
@@ -198,6 +124,5 @@ if __name__ == '__main__':
         print(solve_it(input_data))
     else:
         print('This test requires an input file.  Please select one from the data directory. (i.e. python solver.py ./data/ks_4_0)')
-    del memoTable
     gc.collect()
 
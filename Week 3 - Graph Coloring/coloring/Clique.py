@@ -0,0 +1,105 @@
+import numpy as np
+
+#Number of start nodes (largest degrees first) tried by the greedy clique
+GREEDY_STARTS = 32
+
+#   Maximum clique of the graph, a lower bound on the number of colors of any coloring
+#   Sets of nodes are Python integers used as bitsets. The nodes are renumbered by decreasing degree, so the lowest bit
+#   of a set is its node of largest degree
+class Clique:
+
+    #The graph adjacency in CSR form: the neighbors of node i are indices[indptr[i]:indptr[i+1]]
+    def __init__(self,indptr,indices):
+        self.size = len(indptr) - 1
+        degrees = np.diff(indptr)
+        self.order = np.argsort(-degrees,kind='stable')
+        position = np.empty(self.size,dtype=np.int64)
+        position[self.order] = np.arange(self.size)
+
+        self.adjacency = []
+        for node in self.order.tolist():
+            neighbors = np.zeros(self.size,dtype=bool)
+            neighbors[position[indices[indptr[node]:indptr[node+1]]]] = True
+            self.adjacency.append(int.from_bytes(np.packbits(neighbors,bitorder='little').tobytes(),'little'))
+
+        self.best = []
+        self.expanded = 0
+        self.optimal = False
+
+    #Original node IDs of a list of renumbered nodes
+    def getNodes(self,clique):
+        return sorted(self.order[clique].tolist()) if clique else []
+
+    #Grow a clique from each of the first start nodes, adding each time the candidate with the most candidate neighbors
+    def getGreedyClique(self):
+        best = []
+        for start in range(min(GREEDY_STARTS,self.size)):
+            clique = [start]
+            candidates = self.adjacency[start]
+            while candidates:
+                node = -1
+                mostNeighbors = -1
+                remaining = candidates
+                while remaining:
+                    candidate = (remaining & -remaining).bit_length() - 1
+                    remaining ^= 1 << candidate
+                    neighbors = (self.adjacency[candidate] & candidates).bit_count()
+                    if neighbors > mostNeighbors:
+                        node,mostNeighbors = candidate,neighbors
+                clique.append(node)
+                candidates &= self.adjacency[node]
+            if len(clique) > len(best):
+                best = clique
+        if len(best) > len(self.best):
+            self.best = best
+        return self.getNodes(self.best)
+
+    #Branch and bound over the candidate sets, bounded by a greedy coloring of the candidates (a clique takes at most one
+    #node of each color class). The search stops after expanding nodeLimit subproblems; optimal tells whether it finished
+    #Returns the original IDs of the largest clique found
+    def getMaxClique(self,nodeLimit = None):
+        self.getGreedyClique()
+        self.expanded = 0
+        self.nodeLimit = nodeLimit
+        candidates = (1 << self.size) - 1
+        self.optimal = self.expand([],candidates)
+        return self.getNodes(self.best)
+
+    #Returns False when the node limit stopped the search
+    def expand(self,clique,candidates):
+        self.expanded += 1
+        if self.nodeLimit is not None and self.expanded > self.nodeLimit:
+            return False
+        order,bounds = self.colorSort(candidates)
+        for i in range(len(order)-1,-1,-1):
+            if len(clique) + bounds[i] <= len(self.best):
+                return True
+            node = order[i]
+            clique.append(node)
+            subproblem = candidates & self.adjacency[node]
+            if subproblem:
+                if not self.expand(clique,subproblem):
+                    clique.pop()
+                    return False
+            elif len(clique) > len(self.best):
+                self.best = list(clique)
+            clique.pop()
+            candidates &= ~(1 << node)
+        return True
+
+    #Greedy coloring of the candidates in node order: returns the nodes by color class and the color of each one
+    def colorSort(self,candidates):
+        order = []
+        bounds = []
+        color = 0
+        uncolored = candidates
+        while uncolored:
+            color += 1
+            available = uncolored
+            while available:
+                node = (available & -available).bit_length() - 1
+                available &= ~(self.adjacency[node] | (1 << node))
+                uncolored &= ~(1 << node)
+                order.append(node)
+                bounds.append(color)
+        return order,bounds
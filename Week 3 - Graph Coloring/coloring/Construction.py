@@ -0,0 +1,72 @@
+import heapq
+import numpy as np
+
+#   Constructive heuristics that give the initial coloring of the tabu search
+#   Every method takes the graph adjacency in CSR form (the neighbors of node i are indices[indptr[i]:indptr[i+1]])
+#   and returns the color of each node, with the colors numbered from 0 without gaps
+class Construction:
+
+    #DSATUR: color next the node with the most distinct colors among its neighbors (saturation), ties broken by degree,
+    #with the lowest color none of its neighbors has
+    #The candidates are kept in a heap with lazy deletion: a node is pushed again every time its saturation grows
+    @staticmethod
+    def getDSatur(indptr,indices):
+        size = len(indptr) - 1
+        degrees = np.diff(indptr).tolist()
+        colors = [-1]*size
+        adjacentColors = [set() for _ in range(size)]
+        heap = [(0,-degrees[node],node) for node in range(size)]
+        heapq.heapify(heap)
+
+        while heap:
+            saturation,_,node = heapq.heappop(heap)
+            if colors[node] != -1 or -saturation != len(adjacentColors[node]):
+                continue
+            color = 0
+            while color in adjacentColors[node]:
+                color += 1
+            colors[node] = color
+            for adjacent in indices[indptr[node]:indptr[node+1]].tolist():
+                if colors[adjacent] == -1 and color not in adjacentColors[adjacent]:
+                    adjacentColors[adjacent].add(color)
+                    heapq.heappush(heap,(-len(adjacentColors[adjacent]),-degrees[adjacent],adjacent))
+
+        return np.array(colors,dtype=np.int64)
+
+    #Recursive Largest First: build one color class at a time as a maximal independent set of the uncolored nodes
+    #The class starts with the uncolored node of largest degree among the uncolored nodes. Then it takes, among the nodes
+    #that can still join it, the one with the most neighbors that can no longer join (so the conflicts stay together),
+    #ties broken by the fewest neighbors that still can. The neighbor counts are updated incrementally with bincount
+    @staticmethod
+    def getRLF(indptr,indices):
+        size = len(indptr) - 1
+        rows = np.repeat(np.arange(size),np.diff(indptr))
+        colors = np.full(size,-1,dtype=np.int64)
+        color = 0
+
+        while (colors == -1).any():
+            #Nodes that can still join the class, and the number of neighbors of each node that can or cannot join it
+            candidates = colors == -1
+            candidateDegree = np.bincount(rows,weights=candidates[indices],minlength=size).astype(np.int64)
+            blockedDegree = np.zeros(size,dtype=np.int64)
+
+            node = int(np.argmax(np.where(candidates,candidateDegree,-1)))
+            while True:
+                colors[node] = color
+                candidates[node] = False
+                neighbors = indices[indptr[node]:indptr[node+1]]
+                blocked = neighbors[candidates[neighbors]]
+                candidates[blocked] = False
+
+                #The class node and its candidate neighbors stop being candidates, and the latter become blocked
+                blockedNeighbors = np.concatenate([indices[indptr[i]:indptr[i+1]] for i in blocked.tolist()] + [np.empty(0,dtype=indices.dtype)])
+                candidateDegree -= np.bincount(np.concatenate((neighbors,blockedNeighbors)),minlength=size)
+                blockedDegree += np.bincount(blockedNeighbors,minlength=size)
+
+                if not candidates.any():
+                    break
+                score = blockedDegree*(size+1) - candidateDegree
+                node = int(np.argmax(np.where(candidates,score,np.iinfo(np.int64).min)))
+            color += 1
+
+        return colors
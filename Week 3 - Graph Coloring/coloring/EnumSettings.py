@@ -0,0 +1,13 @@
+from enum import Enum
+
+#   Enum to choose the constructive heuristic that gives the initial coloring
+class Constructor(Enum):
+    Greedy = "First available color in index order"
+    DSatur = "DSATUR"
+    RLF = "Recursive Largest First"
+
+#   Enum to choose how the tabu search is run
+class Mode(Enum):
+    TabuSearch = "Sequential Tabu Search"
+    Portfolio = "Parallel Portfolio of Tabu Searches"
+    Tabucol = "Tabucol with a gamma table"
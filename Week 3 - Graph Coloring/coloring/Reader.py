@@ -0,0 +1,13 @@
+import numpy as np
+
+#   Parse the instance in bulk: the whole input is read as one array of integers
+class Reader:
+
+    #Returns the number of nodes and the edges as an array with one row per edge
+    @staticmethod
+    def readEdges(input_data):
+        tokens = np.fromstring(input_data,dtype=np.int64,sep=' ')
+        node_count = int(tokens[0])
+        edge_count = int(tokens[1])
+        edges = tokens[2:2+2*edge_count].reshape(edge_count,2)
+        return node_count,edges
@@ -0,0 +1,70 @@
+import random
+import numpy as np
+
+#Fixed part of the tabu tenure and weight of the number of conflicts in it (Galinier and Hao)
+TENURE_BASE = 10
+TENURE_CONFLICTS = 0.6
+
+#   Tabucol: tabu search for a coloring with k colors minimizing the number of conflicting edges
+#   The gamma table keeps, for each node and color, the number of neighbors with that color. Moving node v to color c
+#   changes the conflicts by gamma[v][c] - gamma[v][color of v], so every move is scored in O(1) and a move updates the
+#   table in O(degree). After a node leaves a color, going back to it is tabu for a tenure that grows with the conflicts
+class Tabucol:
+
+    #The graph adjacency in CSR form: the neighbors of node i are indices[indptr[i]:indptr[i+1]]
+    def __init__(self,indptr,indices,rng = random):
+        self.indptr = indptr
+        self.indices = indices
+        self.size = len(indptr) - 1
+        self.rows = np.repeat(np.arange(self.size),np.diff(indptr))
+        self.rng = rng
+        self.iterations = 0
+
+    #Search a coloring with colors 0..k-1 starting from the given one (colors out of range are reassigned at random)
+    #Returns whether a coloring without conflicts was found and the coloring with the least conflicts
+    def solve(self,coloring,k,iterations):
+        colors = np.array(coloring,dtype=np.int64)
+        outside = np.flatnonzero((colors < 0) | (colors >= k))
+        for node in outside.tolist():
+            colors[node] = self.rng.randrange(k)
+
+        gamma = np.zeros((self.size,k),dtype=np.int64)
+        np.add.at(gamma,(self.rows,colors[self.indices]),1)
+        ids = np.arange(self.size)
+        conflicts = int(gamma[ids,colors].sum()) // 2
+        expires = np.zeros((self.size,k),dtype=np.int64)
+
+        bestConflicts = conflicts
+        bestColors = colors.copy()
+        self.iterations = 0
+        for iteration in range(iterations):
+            if conflicts == 0:
+                break
+            self.iterations += 1
+            conflicting = np.flatnonzero(gamma[ids,colors] > 0)
+            deltas = gamma[conflicting] - gamma[conflicting,colors[conflicting]][:,None]
+            deltas[np.arange(conflicting.size),colors[conflicting]] = np.iinfo(np.int64).max
+            #Tabu moves are allowed when they lead to less conflicts than the best coloring (Aspiration Criteria)
+            forbidden = (expires[conflicting] > iteration) & (conflicts + deltas >= bestConflicts)
+            deltas[forbidden] = np.iinfo(np.int64).max
+
+            bestDelta = deltas.min()
+            if bestDelta == np.iinfo(np.int64).max:
+                continue
+            candidates = np.flatnonzero(deltas == bestDelta)
+            row,color = divmod(int(candidates[self.rng.randrange(candidates.size)]),k)
+            node = int(conflicting[row])
+
+            previous = int(colors[node])
+            neighbors = self.indices[self.indptr[node]:self.indptr[node+1]]
+            gamma[neighbors,previous] -= 1
+            gamma[neighbors,color] += 1
+            colors[node] = color
+            conflicts += int(bestDelta)
+            expires[node,previous] = iteration + 1 + self.rng.randrange(TENURE_BASE) + int(TENURE_CONFLICTS*conflicts)
+
+            if conflicts < bestConflicts:
+                bestConflicts = conflicts
+                bestColors = colors.copy()
+
+        return bestConflicts == 0,bestColors
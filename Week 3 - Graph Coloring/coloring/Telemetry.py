@@ -0,0 +1,59 @@
+import json
+import time
+
+#   Counters of the tabu search, read from the attributes or snapshot() and written as JSON lines to a stream
+#   The search only increments integers; a line is written when due() finds the interval (in seconds) has passed,
+#   so the cost of the output does not grow with the number of iterations
+class Telemetry:
+
+    def __init__(self,stream = None,interval = 1.0):
+        self.stream = stream
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.nextDump = self.start + interval if interval is not None else None
+
+        self.iterations = 0
+        self.movesEvaluated = 0         #Moves scored by the move selection
+        self.tabuHits = 0               #Scored moves that were tabu
+        self.aspirationOverrides = 0    #Tabu moves chosen because of the Aspiration Criteria
+        self.perturbations = 0          #Random or least frequent reassignments
+        self.restarts = 0
+        self.phases = 0                 #Searches with one color less
+
+    def getElapsed(self):
+        return time.perf_counter() - self.start
+
+    def getIterationsPerSecond(self):
+        elapsed = self.getElapsed()
+        return self.iterations/elapsed if elapsed > 0 else 0.0
+
+    #Counters and the given search state (colors, violated constraints...) as a dictionary
+    def snapshot(self,**state):
+        record = {
+            "elapsed": round(self.getElapsed(),6),
+            "iterations": self.iterations,
+            "iterationsPerSecond": round(self.getIterationsPerSecond(),3),
+            "movesEvaluated": self.movesEvaluated,
+            "tabuHits": self.tabuHits,
+            "aspirationOverrides": self.aspirationOverrides,
+            "perturbations": self.perturbations,
+            "restarts": self.restarts,
+            "phases": self.phases
+        }
+        record.update(state)
+        return record
+
+    #Whether a periodic line should be written now
+    def due(self):
+        if self.stream is None or self.nextDump is None:
+            return False
+        return time.perf_counter() >= self.nextDump
+
+    #Write one JSON line with the counters and the search state
+    def dump(self,event = "progress",**state):
+        if self.stream is None:
+            return
+        self.stream.write(json.dumps(self.snapshot(event=event,**state)) + "\n")
+        self.stream.flush()
+        if self.nextDump is not None:
+            self.nextDump = time.perf_counter() + self.interval
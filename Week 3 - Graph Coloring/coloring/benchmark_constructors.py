@@ -0,0 +1,38 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Compare the constructive heuristics on every instance in the data directory:
+#colors of the initial solution and wall time of the whole solve (construction and tabu search) with each one
+
+import os
+import io
+import time
+import contextlib
+from EnumSettings import Constructor
+from solver import BuildGraph,GetInitialSolution,solve_it
+
+def benchmark(input_data,constructor):
+    graph = BuildGraph(input_data)
+    initialColors = len(GetInitialSolution(graph,set(graph.palette),constructor))
+    start = time.perf_counter()
+    #The search progress is not part of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_data = solve_it(input_data,constructor)
+    end = time.perf_counter()
+    finalColors = int(output_data.split()[0])
+    return initialColors,finalColors,end-start
+
+if __name__ == '__main__':
+    import sys
+    directory = './data'
+    names = sys.argv[1:] if len(sys.argv) > 1 else sorted(os.listdir(directory),key=lambda name: (int(name.split('_')[1]),name))
+    constructors = list(Constructor)
+    print("{:<12}".format("Instance") + "".join(" {:>24}".format(constructor.name + " k0/k/time (s)") for constructor in constructors))
+    for name in names:
+        with open(os.path.join(directory,name), 'r') as input_data_file:
+            input_data = input_data_file.read()
+        line = "{:<12}".format(name)
+        for constructor in constructors:
+            initialColors,finalColors,elapsed = benchmark(input_data,constructor)
+            line += " {:>24}".format("{}/{}/{:.2f}".format(initialColors,finalColors,elapsed))
+        print(line,flush=True)
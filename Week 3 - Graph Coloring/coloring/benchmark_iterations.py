@@ -0,0 +1,47 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Report the time per tabu search iteration (move selection and assignment) of graph coloring instances
+#Each instance starts from the greedy solution with the colors reduced to a fraction of the greedy colors
+
+import os
+import math
+import time
+from solver import BuildGraph,GetInitialSolution,RemoveColor,TabuList,GetNextBetterAssigment,AssingColor
+
+#Fraction of the greedy colors kept, so the search runs with many conflicts
+REDUCTION = 0.8
+
+def benchmark(file_location,iterations):
+    with open(file_location, 'r') as input_data_file:
+        input_data = input_data_file.read()
+    graph = BuildGraph(input_data)
+    colorsUsed = GetInitialSolution(graph,set(graph.palette))
+    graph.colorsUsed = set(colorsUsed)
+    while len(graph.colorsUsed) > int(REDUCTION*len(colorsUsed)):
+        RemoveColor(graph)
+
+    tabuList = TabuList(graph.length,graph.colorCount)
+    tenure = int(1.25*math.sqrt(graph.length))
+    done = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        nodeId,color,violations = GetNextBetterAssigment(graph,tabuList)
+        if color == -1:
+            break
+        AssingColor(graph,nodeId,color)
+        tabuList.nextIteration()
+        tabuList.add((nodeId,color),violations,tenure)
+        done += 1
+    end = time.perf_counter()
+    return graph.length,len(graph.colorsUsed),done,(end-start)/max(1,done)
+
+if __name__ == '__main__':
+    import sys
+    directory = './data'
+    names = sys.argv[1:] if len(sys.argv) > 1 else [name for name in sorted(os.listdir(directory)) if name.startswith(('gc_500_','gc_1000_'))]
+    iterations = 1000
+    print("{:<20} {:>8} {:>8} {:>12} {:>16}".format("Instance","Nodes","Colors","Iterations","Iteration (ms)"))
+    for name in names:
+        nodes,colors,done,elapsed = benchmark(os.path.join(directory,name),iterations)
+        print("{:<20} {:>8} {:>8} {:>12} {:>16.3f}".format(name,nodes,colors,done,elapsed*1000))
@@ -0,0 +1,34 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Compare the sequential tabu search with Tabucol: colors of the final solution and wall time of the whole solve
+
+import os
+import io
+import time
+import contextlib
+from EnumSettings import Mode
+from solver import solve_it
+
+def benchmark(input_data,mode):
+    start = time.perf_counter()
+    #The search progress is not part of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_data = solve_it(input_data,mode=mode)
+    end = time.perf_counter()
+    return int(output_data.split()[0]),end-start
+
+if __name__ == '__main__':
+    import sys
+    directory = './data'
+    names = sys.argv[1:] if len(sys.argv) > 1 else sorted(os.listdir(directory),key=lambda name: (int(name.split('_')[1]),name))
+    modes = [Mode.TabuSearch,Mode.Tabucol]
+    print("{:<12}".format("Instance") + "".join(" {:>20}".format(mode.name + " k/time (s)") for mode in modes))
+    for name in names:
+        with open(os.path.join(directory,name), 'r') as input_data_file:
+            input_data = input_data_file.read()
+        line = "{:<12}".format(name)
+        for mode in modes:
+            colors,elapsed = benchmark(input_data,mode)
+            line += " {:>20}".format("{}/{:.2f}".format(colors,elapsed))
+        print(line,flush=True)
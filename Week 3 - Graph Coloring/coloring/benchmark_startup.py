@@ -0,0 +1,33 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Report the parse and graph build latency of every instance in the data directory
+
+import os
+import time
+from Reader import Reader
+from solver import Graph
+
+def benchmark(file_location,repetitions):
+    with open(file_location, 'r') as input_data_file:
+        input_data = input_data_file.read()
+    parseTime = 0.0
+    buildTime = 0.0
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        node_count,edges = Reader.readEdges(input_data)
+        parsed = time.perf_counter()
+        Graph(node_count,edges)
+        end = time.perf_counter()
+        parseTime += parsed - start
+        buildTime += end - parsed
+    return node_count,len(edges),parseTime/repetitions,buildTime/repetitions
+
+if __name__ == '__main__':
+    import sys
+    directory = sys.argv[1].strip() if len(sys.argv) > 1 else './data'
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print("{:<20} {:>8} {:>8} {:>12} {:>12}".format("Instance","Nodes","Edges","Parse (ms)","Build (ms)"))
+    for name in sorted(os.listdir(directory),key=lambda name: (int(name.split('_')[1]),name)):
+        nodes,edges,parseTime,buildTime = benchmark(os.path.join(directory,name),repetitions)
+        print("{:<20} {:>8} {:>8} {:>12.3f} {:>12.3f}".format(name,nodes,edges,parseTime*1000,buildTime*1000))
@@ -11,112 +11,214 @@
 import gc
 import random
 import math
+import time
+import multiprocessing
 from collections import defaultdict
-import copy
+import numpy as np
+from EnumSettings import Constructor,Mode
+from Construction import Construction
+from Clique import Clique
+from Tabucol import Tabucol
+from Reader import Reader
+
+#Subproblems expanded by the maximum clique search that gives the lower bound
+CLIQUE_NODE_LIMIT = 5000
+
+#Iterations between two checks of the stop condition of the tabu search
+STOP_CHECK_INTERVAL = 256
+
+#Extra attempts (after a random restart) of a portfolio worker at the same number of colors
+PORTFOLIO_RESTARTS = 2
+
+#Seconds a portfolio worker that gave up waits before checking the shared state again
+PORTFOLIO_WAIT_INTERVAL = 0.05
 
 #Definition of class Node
 class Node:
-    def __init__(self,id = -1,colors = None):
-        self.degree = 0
+    def __init__(self,id = -1,adjacentColors = None,adjacentIds = None):
+        self.degree = 0 if adjacentIds is None else len(adjacentIds)
         self.color = -1
-        self.adjacentList = []
-        self.adjacentColors = {}
-        self.ColorsDomain = colors
+        self.adjacentIds = adjacentIds #Neighbor IDs (slice of the graph CSR indices)
+        self.adjacentColors = adjacentColors #Number of neighbors with each color (row of the graph conflict matrix)
         self.id = id #Node ID
         
+#Set of node IDs with O(1) insertion, removal and membership test
+#The IDs are kept packed in a list (the removed ID is replaced by the last one), so the set can be read as an array
+class IndexedSet:
+    def __init__(self):
+        self.elements = []
+        self.positions = {}
+
+    def add(self,element):
+        if element not in self.positions:
+            self.positions[element] = len(self.elements)
+            self.elements.append(element)
+
+    def discard(self,element):
+        position = self.positions.pop(element,None)
+        if position is None:
+            return
+        last = self.elements.pop()
+        if position < len(self.elements):
+            self.elements[position] = last
+            self.positions[last] = position
+
+    def __contains__(self,element):
+        return element in self.positions
+
+    def __len__(self):
+        return len(self.elements)
+
+    def clear(self):
+        self.elements = []
+        self.positions.clear()
+
 #Definition of Graph Class
+#The adjacency is kept in CSR form: the neighbors of node i are indices[indptr[i]:indptr[i+1]]
+#Memory is O(n+m) for the adjacency plus the conflict matrix, which has one column per color that can be used
 class Graph:
-    def __init__ (self,num_nodes):
+    def __init__ (self,num_nodes,edges):
         self.idx = 0
         self.nodes = []
 
+        #Build the CSR arrays from the edge list: each edge is stored in both directions, grouped by the first node
+        sources = np.concatenate((edges[:,0],edges[:,1]))
+        targets = np.concatenate((edges[:,1],edges[:,0]))
+        self.degrees = np.bincount(sources,minlength=num_nodes)
+        self.indptr = np.zeros(num_nodes+1,dtype=np.int64)
+        np.cumsum(self.degrees,out=self.indptr[1:])
+        self.indices = targets[np.argsort(sources,kind='stable')]
+
+        #A greedy coloring never needs more colors than the maximum degree plus one, which bounds the colors domain
+        self.colorCount = int(self.degrees.max()) + 1 if num_nodes > 0 else 1
+        self.SetPalette(range(0,self.colorCount))
+
+        #Conflict matrix: conflicts[node][color] is the number of neighbors of the node with that color
+        #It is updated in O(degree) on each color change, so the moves of all nodes can be evaluated at once
+        #A color is in the domain of a node while no neighbor has it (count equals zero)
+        self.conflicts = np.zeros((num_nodes,self.colorCount),dtype=np.int32)
+        self.colors = np.full(num_nodes,-1,dtype=np.int64)
+        self.ids = np.arange(num_nodes)
+
+        #Nodes that have at least one neighbor with the same color
+        self.conflictingNodes = IndexedSet()
+
         for i in range(0,num_nodes):
-            self.nodes.append(Node(i,set(range(0,num_nodes))))
+            self.nodes.append(Node(i,self.conflicts[i],self.indices[self.indptr[i]:self.indptr[i+1]]))
 
         self.length = num_nodes
         self.colorsUsed =  set()
         self.violatedConstraints = 0
-        self.edge_count = 0
+        self.edge_count = len(edges)
+
+        #The density never changes, so its square root (used by the objective and the tabu penalty) is computed once
+        self.densityRoot = math.sqrt(self.GetDensity()) if num_nodes > 0 else 0.0
+
+    #Set the colors the nodes can take
+    #The palette is shared by every node and the domain of a node is the palette minus the colors of its neighbors
+    #(positive counts in the conflict matrix), so changing it copies nothing per node
+    def SetPalette(self,colors):
+        self.palette = frozenset(colors)
+        self.paletteArray = np.array(sorted(self.palette),dtype=np.int64)
+
+    #Edge list (each edge once) rebuilt from the CSR arrays
+    def GetEdges(self):
+        rows = np.repeat(self.ids,self.degrees)
+        keep = rows < self.indices
+        return np.column_stack((rows[keep],self.indices[keep]))
 
     def GetDensity(self):
         return 2*self.edge_count/self.length*(self.length-1)
 
 #Definition of TabuList Class
 class TabuList:
-    def __init__(self): 
+    def __init__(self,nodes = 0,colors = 0): 
         #Recency-based Memory
-        self.elements = defaultdict(list) 
+        #An assignment (node,color) is tabu while the iteration is lower than the iteration it expires at,
+        #so checking, adding and removing an element is O(1) and nothing is swept at each iteration
+        self.iteration = 0
+        self.expires = np.zeros((nodes,colors),dtype=np.int64)
+        self.recorded = np.zeros((nodes,colors),dtype=np.int64) #Violations recorded when the assignment became tabu
 
         #Long-term memory
         self.frequencies = defaultdict(list)
 
-    #Decrease penalties and remove from Tabu elements that has no restriction penalty
-    def decreasePenalties(self):
-        toBeDeleted = []
-        for key in self.elements.keys():
-            self.elements[key][0] -=1
-            if self.elements[key][0] == 0:
-                toBeDeleted.append(key)
-
-        for i in range(0,len(toBeDeleted)):
-            self.elements.pop(toBeDeleted[i],None)
+    #Move to the next iteration, releasing the elements whose restriction penalty is over
+    def nextIteration(self):
+        self.iteration += 1
             
     #Add one element to Tabu
     def add(self,element,violations,threshold):
-        self.elements[element] = [threshold,violations]
+        self.expires[element] = self.iteration + threshold
+        self.recorded[element] = violations
 
         if(element in self.frequencies.keys()):
             self.frequencies[element][0] +=1
         else:
             self.frequencies[element] = [1,violations] #Frequency/Violation
 
+    def IsTabu(self,element):
+        return self.expires[element] > self.iteration
+
+    #Mask of the assignments of the nodes to the colors that are tabu. The nodes can be a single node or an array of nodes
+    def Tabu(self,nodes,colors):
+        index = np.ix_(nodes,colors) if np.ndim(nodes) else (nodes,colors)
+        return self.expires[index] > self.iteration
+
     #Remove an element in case the current violations are less than the violations recorded
     def Update(self,element,violations):
-        if(element in self.elements.keys()):
-            if(self.elements[element][1] > violations):
-                self.elements.pop(element,None)
+        if self.IsTabu(element):
+            if(self.recorded[element] > violations):
+                self.expires[element] = 0
                 return True
             else:
                 return False
         else:
             return False
 
+    #Mask of the assignments of the nodes to the colors that are tabu and not released by the Aspiration Criteria,
+    #given the violations of each assignment. The nodes can be a single node or an array of nodes
+    def Forbidden(self,nodes,colors,violations):
+        index = np.ix_(nodes,colors) if np.ndim(nodes) else (nodes,colors)
+        return self.Tabu(nodes,colors) & (self.recorded[index] <= violations)
+
     def Length(self):
-        return len(self.elements)
+        return int(np.count_nonzero(self.expires > self.iteration))
 
     def Clear(self):
-        self.elements.clear()
+        self.expires[:] = 0
+
+    #Forget a color removed from the palette: its tabu assignments and its long-term memory
+    def RemoveColor(self,color):
+        self.expires[:,color] = 0
+        for element in [element for element in self.frequencies.keys() if element[1] == color]:
+            self.frequencies.pop(element,None)
+
+#Read the instance and build the graph
+def BuildGraph(input_data):
+    node_count,edges = Reader.readEdges(input_data)
+    return Graph(node_count,edges)
 
-def solve_it(input_data):
+#The telemetry receives the counters of the tabu search (TabuSearch mode)
+def solve_it(input_data,constructor = Constructor.Greedy,mode = Mode.TabuSearch,workers = None,telemetry = None):
     # Modify this code to run your optimization algorithm
 
     # parse the input
-    lines = input_data.split('\n')
-
-    first_line = lines[0].split()
-    node_count = int(first_line[0])
-    edge_count = int(first_line[1])
-    graph = Graph(node_count)
-
-    #Build the graph
-    for i in range(1, edge_count + 1):
-        line = lines[i]
-        parts = line.split()
-        graph.nodes[int(parts[0])].adjacentList.append(graph.nodes[int(parts[1])])
-        graph.nodes[int(parts[1])].adjacentList.append(graph.nodes[int(parts[0])])
-        graph.nodes[int(parts[0])].degree = graph.nodes[int(parts[0])].degree + 1
-        graph.nodes[int(parts[1])].degree = graph.nodes[int(parts[1])].degree + 1
-
-    graph.edge_count = edge_count
+    graph = BuildGraph(input_data)
     
     #Set the Upper Bound
-    colors = set(range(0, node_count))
+    colors = set(graph.palette)
 
     #Use Tabu Search to find the solution
-    solutionColors, solution = TabuSearch(graph,colors)
+    if mode == Mode.Portfolio:
+        solutionColors, solution, optimal = PortfolioSearch(graph,colors,constructor,workers)
+    elif mode == Mode.Tabucol:
+        solutionColors, solution, optimal = TabucolSearch(graph,colors,constructor)
+    else:
+        solutionColors, solution, optimal = TabuSearch(graph,colors,constructor,telemetry=telemetry)
 
     # prepare the solution in the specified output format
-    output_data = str(solutionColors) + ' ' + str(0) + '\n'
+    output_data = str(solutionColors) + ' ' + str(1 if optimal else 0) + '\n'
     output_data += ' '.join(map(str, solution))
 
     del graph.nodes
@@ -126,43 +228,174 @@ def solve_it(input_data):
     return output_data
 
 
-def TabuSearch(graph,colors,iterations=100000):
+def TabuSearch(graph,colors,constructor = Constructor.Greedy,iterations=100000,telemetry = None):
     print("Instance: {}".format(graph.length))
 
-    #Get an initial Greedy Solution
-    colorsUsed = GetInitialSolution(graph,colors)
-    graph.colorsUsed = copy.deepcopy(colorsUsed)
+    #Get an initial Solution
+    colorsUsed = GetInitialSolution(graph,colors,constructor)
+    graph.colorsUsed = set(colorsUsed)
 
     #Save the solution as the current solution
     currentsolutionColors = len(graph.colorsUsed)   
-    currentSolution = []
-    for i in range(0,graph.length):
-        currentSolution.append(graph.nodes[i].color)
+    currentSolution = graph.colors.tolist()
     currentObjectiveFunction = Evaluate(graph)
 
+    #Once the solution uses as many colors as the lower bound it is optimal, and no attempt with less colors is made
+    lowerBound = GetLowerBound(graph)
+    optimal = currentsolutionColors == lowerBound
+    print("Lower Bound: {} - Initial Colors: {}".format(lowerBound,currentsolutionColors))
+
     #Parameter to penalize assignments to be inserted into the tabu list
     alpha = int(1.25*math.sqrt(graph.length))
 
+    #The tabu list lives across the color reductions, so each one starts with the tabu assignments of the remaining colors
+    tabuList = TabuList(graph.length,graph.colorCount)
+
     #Remove one color from the colors domain (reduce the upper bound) and try to reallocate the colors of the nodes
-    while True:    
-        graph = RemoveColor(graph)
-        newSolution = GetSolution(graph,iterations,alpha)
+    while not optimal:    
+        graph = RemoveColor(graph,tabuList)
+        newSolution = GetSolution(graph,iterations,alpha,random,None,tabuList,telemetry)
         #In case the solution found is better than current solution, make the better solution as current
         #Otherwise, terminate the execution
         if (currentObjectiveFunction > Evaluate(newSolution)):
             currentsolutionColors = len(newSolution.colorsUsed)
-            currentSolution = []
-            for i in range(0,newSolution.length):
-                currentSolution.append(newSolution.nodes[i].color)
+            currentSolution = newSolution.colors.tolist()
             currentObjectiveFunction = Evaluate(newSolution)
+            optimal = currentsolutionColors == lowerBound and len(newSolution.conflictingNodes) == 0
         else:
             break
 
-    return currentsolutionColors,currentSolution
+    return currentsolutionColors,currentSolution,optimal
 
 
-def GetSolution (graph,iterations,alpha):
-    tabuList = TabuList()
+#Tabucol: search a coloring with one color less than the best one, starting from the best one with the nodes of the
+#removed color recolored at random, until Tabucol fails or the lower bound is reached
+def TabucolSearch(graph,colors,constructor = Constructor.Greedy,iterations=100000,seed=0):
+    print("Instance: {}".format(graph.length))
+    rng = random.Random(seed)
+
+    colorsUsed = GetInitialSolution(graph,colors,constructor)
+    currentsolutionColors = len(colorsUsed)
+    currentSolution = graph.colors.copy()
+    lowerBound = GetLowerBound(graph)
+    print("Lower Bound: {} - Initial Colors: {}".format(lowerBound,currentsolutionColors))
+
+    tabucol = Tabucol(graph.indptr,graph.indices,rng)
+    while currentsolutionColors > lowerBound:
+        feasible,coloring = tabucol.solve(currentSolution,currentsolutionColors-1,iterations)
+        print("Colors: {} - Feasible: {} - Iterations: {}".format(currentsolutionColors-1,feasible,tabucol.iterations))
+        if not feasible:
+            break
+        #Renumber the colors from 0 without gaps, in case the coloring found uses even less colors
+        _,currentSolution = np.unique(coloring,return_inverse=True)
+        currentsolutionColors = int(currentSolution.max()) + 1
+
+    return currentsolutionColors,currentSolution.tolist(),currentsolutionColors == lowerBound
+
+#Lower Bound: every node of a clique needs its own color
+def GetLowerBound(graph):
+    return len(Clique(graph.indptr,graph.indices).getMaxClique(CLIQUE_NODE_LIMIT))
+
+#Portfolio of tabu searches in parallel processes, each one with its own random generator and tabu penalty (alpha)
+#The best number of colors and its solution are shared: as soon as one worker finds a feasible coloring,
+#all of them restart from it with one color less. The search ends when every worker gave up on the same number of colors
+def PortfolioSearch(graph,colors,constructor = Constructor.Greedy,workers = None,iterations=100000,seed=0):
+    print("Instance: {}".format(graph.length))
+    workers = workers if workers is not None else multiprocessing.cpu_count()
+
+    colorsUsed = GetInitialSolution(graph,colors,constructor)
+    lowerBound = GetLowerBound(graph)
+    print("Lower Bound: {} - Initial Colors: {}".format(lowerBound,len(colorsUsed)))
+
+    best = multiprocessing.Value('i',len(colorsUsed))
+    gaveUp = multiprocessing.Value('i',0,lock=False) #Workers out of attempts at the current best, guarded by the lock of best
+    solution = multiprocessing.Array('i',graph.colors.tolist(),lock=False)
+    alpha = int(1.25*math.sqrt(graph.length))
+    edges = graph.GetEdges()
+
+    #The penalties are spread evenly between half and one and a half times the sequential alpha, centered on it,
+    #so a single worker uses the sequential alpha
+    processes = []
+    for worker in range(workers):
+        workerAlpha = max(1,int(alpha*(0.5 + (worker+0.5)/workers)))
+        processes.append(multiprocessing.Process(target=PortfolioWork,args=(graph.length,edges,lowerBound,iterations,workerAlpha,seed+worker,best,gaveUp,solution,workers)))
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    return best.value,list(solution),best.value == lowerBound
+
+#Worker of the portfolio: take the best shared solution, remove one color and search until a feasible coloring is found,
+#another worker finds one first or the attempts are over
+#A worker out of attempts waits until another worker improves the best solution, then moves to the new number of colors,
+#or until all the workers gave up
+def PortfolioWork(node_count,edges,lowerBound,iterations,alpha,seed,best,gaveUp,solution,workers):
+    rng = random.Random(seed)
+    graph = Graph(node_count,edges)
+    tabuList = TabuList(graph.length,graph.colorCount)
+    while True:
+        with best.get_lock():
+            target = best.value - 1
+            coloring = list(solution)
+        if target < lowerBound:
+            break
+
+        LoadColoring(graph,coloring)
+        while len(graph.colorsUsed) > target:
+            RemoveColor(graph,tabuList)
+
+        stop = lambda: best.value <= target
+        found = False
+        for attempt in range(0,PORTFOLIO_RESTARTS+1):
+            GetSolution(graph,iterations,alpha,rng,stop,tabuList)
+            if len(graph.conflictingNodes) == 0 and (graph.colors >= 0).all():
+                found = True
+                break
+            if stop():
+                break
+
+        if found:
+            colorsCount = len(np.unique(graph.colors))
+            with best.get_lock():
+                if colorsCount < best.value:
+                    best.value = colorsCount
+                    solution[:] = graph.colors.tolist()
+                    gaveUp.value = 0
+        elif not stop():
+            with best.get_lock():
+                if best.value > target:
+                    gaveUp.value += 1
+            while best.value > target and gaveUp.value < workers:
+                time.sleep(PORTFOLIO_WAIT_INTERVAL)
+            if best.value > target:
+                break
+
+#Reset the graph to a coloring, with the colors renumbered from 0 without gaps
+def LoadColoring(graph,coloring):
+    _,colors = np.unique(np.asarray(coloring),return_inverse=True)
+    graph.conflicts[:] = 0
+    graph.colors[:] = -1
+    graph.conflictingNodes.clear()
+    graph.violatedConstraints = 0
+    for node in graph.nodes:
+        node.color = -1
+    for node in graph.nodes:
+        node.color = int(colors[node.id])
+        graph.colors[node.id] = node.color
+        PropagateConstraint(graph,node,node.color)
+    graph.colorsUsed = set(colors.tolist())
+    graph.SetPalette(graph.colorsUsed)
+
+#Run the tabu search with the colors in the palette. The random generator is used by the restarts and the search
+#stops early when stop() becomes true
+#When a tabu list is given the search continues with its memory: the assignments still tabu stay tabu
+#The telemetry counts the iterations, moves and perturbations and writes its periodic lines
+def GetSolution (graph,iterations,alpha,rng = random,stop = None,tabuList = None,telemetry = None):
+    if tabuList is None:
+        tabuList = TabuList(graph.length,graph.colorCount)
+    if telemetry is not None:
+        telemetry.phases += 1
 
     #Increase this parameter if you want to enable random restarts
     restartsLimit = 0
@@ -173,26 +406,32 @@ def GetSolution (graph,iterations,alpha):
         lastImprovement = 0
         bestViolatedConstraints = graph.violatedConstraints
         while i < iterations:
+            if stop is not None and i % STOP_CHECK_INTERVAL == 0 and stop():
+                break
             #Try to find the assigment that violates the least number of contraints
-            nodeId,color,violations = GetNextBetterAssigment(graph,tabuList)
+            nodeId,color,violations = GetNextBetterAssigment(graph,tabuList,telemetry)
             #In case of no assignment is found (infeasible solution), stopr
             if(color == -1):
                 break
             #Make the new color assigmnet
-            AssingColor(graph,nodeId, color,False)
+            AssingColor(graph,nodeId, color)
+            if telemetry is not None:
+                telemetry.iterations += 1
+                if telemetry.due():
+                    telemetry.dump(colors=len(graph.colorsUsed),violatedConstraints=graph.violatedConstraints,best=bestObjectFunction)
 
             #In case the solution does not violate any constraint, terminate the execution (feasible solution found)
             if(graph.violatedConstraints == 0):
                 break
 
-            #Remove assignments from the tabu and updates the penalty count (decrease one in each iteration)
-            tabuList.decreasePenalties()
+            #Move to the next iteration: the assignments whose penalty is over stop being tabu
+            tabuList.nextIteration()
             
             #Dynamic penalty for each assigment
             #Assignments that violates more constraints have a higher penalty in tabu list
             #The penalty also counts the graph density and the number of colors available to be assigned
             #penalty = alpha*int(graph.violatedConstraints + math.sqrt(graph.GetDensity())/len(graph.colorsUsed))
-            penalty = alpha*int(graph.violatedConstraints + pow(graph.violatedConstraints,0.9) + math.sqrt(graph.GetDensity())/len(graph.colorsUsed))
+            penalty = alpha*int(graph.violatedConstraints + pow(graph.violatedConstraints,0.9) + graph.densityRoot/len(graph.colorsUsed))
             #Add the new assignment on Tabu
             tabuList.add((nodeId,color),violations,penalty)
 
@@ -202,51 +441,35 @@ def GetSolution (graph,iterations,alpha):
                 lastImprovement = i
 
             if ((i-lastImprovement) >= epsilon*iterations):
-                print("=========================================================")
-                print("Instance: {} - Iteration {} - Last Improvement: {}".format(graph.length,i,lastImprovement))
-                print("Current Color Domain: {}".format(len(graph.colorsUsed)))
-                print("Current Objective Function: {} - Violated Constraints: {}".format(Evaluate(graph),graph.violatedConstraints))
-                print("Best Objective Function: {} - Violated Constraints: {}".format(bestObjectFunction,bestViolatedConstraints))
-                print("ASSIGNING LEAST FREQUENTY COLORS...")
-                AssignLeastFrequentAssignment(graph,tabuList)
-                print("COLORS ASSIGNED.")
-                print("Instance: {} - Iteration {} - Last Improvement: {}".format(graph.length,i,lastImprovement))
-                print("Current Color Domain: {}".format(len(graph.colorsUsed)))
-                print("Current Objective Function: {} - Violated Constraints: {}".format(Evaluate(graph),graph.violatedConstraints))
-                print("Best Objective Function: {} - Violated Constraints: {}".format(bestObjectFunction,bestViolatedConstraints))      
-                print("=========================================================")
+                AssignLeastFrequentAssignment(graph,tabuList,rng,telemetry)
                 bestObjectFunction = Evaluate(graph)
                 bestViolatedConstraints = graph.violatedConstraints
                 lastImprovement = i
                 continue
             i+=1
         
-        print("END - Instance: {} - Objective Function: {}".format(graph.length,Evaluate(graph)))
+        if telemetry is not None:
+            telemetry.dump("end",colors=len(graph.colorsUsed),violatedConstraints=graph.violatedConstraints,objective=Evaluate(graph))
 
         if(graph.violatedConstraints == 0):
             break
             
-        print("=========================================================")
-        print("Instance: {}".format(graph.length))
-        print("Current Color Domain: {}".format(len(graph.colorsUsed)))
-        print("Violated Constraints: {} - Current Objective Function: {} ".format(graph.violatedConstraints,Evaluate(graph)))
-        print("RANDOM RESTARTING....")
-        AssignRandomColors(graph)
+        AssignRandomColors(graph,rng,telemetry)
         tabuList.Clear()
-        print("RESTARTED")
-        print("Violated Constraints: {} - Current Objective Function: {} ".format(graph.violatedConstraints,Evaluate(graph)))
-        print("Current Color Domain: {}".format(len(graph.colorsUsed)))
-        print("=========================================================")
+        if telemetry is not None:
+            telemetry.restarts += 1
     return graph
 
 #Assign least frequent color to a node
-def AssignLeastFrequentAssignment(graph,tabuList):
+def AssignLeastFrequentAssignment(graph,tabuList,rng = random,telemetry = None):
 
     considerValues = graph.violatedConstraints
 
     if len(tabuList.frequencies.keys())== 0:
-        AssignRandomColors(graph)
+        AssignRandomColors(graph,rng,telemetry)
         return
+    if telemetry is not None:
+        telemetry.perturbations += 1
     if(considerValues == 0):
         considerValues =1
     
@@ -262,150 +485,165 @@ def AssignLeastFrequentAssignment(graph,tabuList):
     valuesToBeConsidered = frequencyValues[:considerValues]
 
     assignments = [k for k in tabuList.frequencies.keys() if tabuList.frequencies[k][0] in valuesToBeConsidered]
-    print("New assignments: {}".format(len(assignments[:considerValues])))
     for assignment in assignments[:considerValues]:
-        AssingColor(graph,assignment[0],assignment[1],False)
+        AssingColor(graph,assignment[0],assignment[1])
 
 #Assign random colors for random nodes
-def AssignRandomColors(graph):
+def AssignRandomColors(graph,rng = random,telemetry = None):
+    if telemetry is not None:
+        telemetry.perturbations += 1
+
     #Get a random number of nodes to be change
-    nodesCount = random.randint(int(0.5*graph.length),int(graph.length))
+    nodesCount = rng.randint(int(0.5*graph.length),int(graph.length))
     if nodesCount == 0:
         nodesCount = 1
 
     #Get the number of colors to use
-    colorsCount = random.randint(1,len(graph.colorsUsed))
+    colorsCount = rng.randint(1,len(graph.colorsUsed))
     nodesChanged = set()
-    print("Perturbation: {} nodes - Colors: {}".format(nodesCount,colorsCount))
     graph.colorsUsed.clear()
     for i in range(0,nodesCount):    
         while True:
-            nodeId = random.randint(0,graph.length-1)
-            newColor = random.randint(0,colorsCount-1)
+            nodeId = rng.randint(0,graph.length-1)
+            newColor = rng.randint(0,colorsCount-1)
             if(nodeId not in nodesChanged):
                 nodesChanged.add(nodeId)     
                 break
 
-        AssingColor(graph,nodeId,newColor,False)
+        AssingColor(graph,nodeId,newColor)
         graph.colorsUsed.add(newColor)
 
 
 #Get the assigment that violates less constraints in the graph
-def GetNextBetterAssigment(graph,tabuList):
-    violationsCount = sys.maxsize
-    currentColor = -1
-    currentNodeId = -1
-
-    for i in range(0,graph.length):
-
-        #Get tne constraint Violation violationsCount for the current assigment
-        violationsCountBefore = GetConstraintViolationsCount(graph.nodes[i],graph.nodes[i].color)
-        
-        #In case of no violation, the best assingnment possible is found, the try another node
-        if violationsCountBefore == 0:
-           continue
-
-        #Get the best assignment for the current node
-        nodeId, color = GetNextAssignment(graph.nodes[i],None,tabuList)
-
-        #In case the assignment is the current color or no color, go to the next node
-        if(color == graph.nodes[nodeId].color or color == -1):
-            continue
-
-        #Get the violations count for the new candidate color
-        violationsCountAfter = GetConstraintViolationsCount(graph.nodes[nodeId],color)
-        
-        #Update the assignment if the new solution is better
-        if violationsCount > (violationsCountAfter - violationsCountBefore):
-            currentColor = color
-            currentNodeId = nodeId
-            violationsCount = (violationsCountAfter - violationsCountBefore)
-
-    return currentNodeId,currentColor,violationsCount
+#The moves of every conflicting node to every color are scored at once from the conflict matrix:
+#the score of a move is the violations of the node with the new color minus the violations with its current color
+def GetNextBetterAssigment(graph,tabuList,telemetry = None):
+    #Nodes without violations already have the best assignment possible, so only the conflicting ones are evaluated
+    if len(graph.conflictingNodes) == 0:
+        return -1,-1,sys.maxsize
+
+    palette = graph.paletteArray
+    colors = graph.colors
+    conflicting = np.array(graph.conflictingNodes.elements,dtype=np.int64)
+    violationsBefore = graph.conflicts[conflicting,colors[conflicting]]
+
+    violationsAfter = graph.conflicts[np.ix_(conflicting,palette)]
+    allowed = palette[None,:] != colors[conflicting,None]
+
+    #Tabu assignments are only allowed when they violate less constraints than recorded (Aspiration Criteria)
+    if telemetry is not None:
+        telemetry.movesEvaluated += int(np.count_nonzero(allowed))
+        telemetry.tabuHits += int(np.count_nonzero(tabuList.Tabu(conflicting,palette) & allowed))
+    allowed &= ~tabuList.Forbidden(conflicting,palette,violationsAfter)
+
+    scores = np.where(allowed,violationsAfter - violationsBefore[:,None],np.iinfo(np.int32).max)
+    best = int(np.argmin(scores))
+    if not allowed.flat[best]:
+        return -1,-1,sys.maxsize
+
+    row,column = divmod(best,palette.size)
+    nodeId = int(conflicting[row])
+    color = int(palette[column])
+    #Remove the assignment from the tabu in case it was chosen by the aspiration criteria
+    if tabuList.Update((nodeId,color),int(violationsAfter[row,column])) and telemetry is not None:
+        telemetry.aspirationOverrides += 1
+    return nodeId,color,int(scores.flat[best])
 
 #Get the assignment that violates the less number of constraints for a node
-def GetNextAssignment(node,currentViolations = None,tabuList = None):
-    
-    if currentViolations is None:
-        currentViolations = sys.maxsize
-
-    colorToBeAssigned = -1
-
-    if tabuList is None:
-        tabuList = TabuList()
-
-    for color in node.ColorsDomain:
-        violationCount = GetConstraintViolationsCount(node,color)
-
-        if((node.id,color) in tabuList.elements):
-            if tabuList.Update((node.id,color),violationCount) == False:
-                continue
-
-        #If other color has the same violation count, try to assign it
-        #It allows more exploration from the algorithm
-        if currentViolations >= violationCount and color != node.color:
-            #Check whether an assignment is in the Tabu. Case it is, try to update in order to remove it if
-            #the new assigment is better (violates less constraints) than the recorded violations
-            #Aspiration Criteria
-                currentViolations = violationCount
-                colorToBeAssigned = color
+def GetNextAssignment(node,palette,currentViolations = None,tabuList = None,telemetry = None):
+    violations = node.adjacentColors[palette]
+    allowed = palette != node.color
+    if telemetry is not None:
+        telemetry.movesEvaluated += int(np.count_nonzero(allowed))
+
+    if currentViolations is not None:
+        allowed &= violations <= currentViolations
+
+    #Check whether an assignment is in the Tabu. Case it is, it is only allowed if the new assigment
+    #is better (violates less constraints) than the recorded violations
+    #Aspiration Criteria
+    if tabuList is not None:
+        if telemetry is not None:
+            telemetry.tabuHits += int(np.count_nonzero(tabuList.Tabu(node.id,palette) & allowed))
+        allowed &= ~tabuList.Forbidden(node.id,palette,violations)
+
+    candidates = np.flatnonzero(allowed)
+    if candidates.size == 0:
+        return node.id,-1
+
+    best = candidates[np.argmin(violations[candidates])]
+    colorToBeAssigned = int(palette[best])
+    if tabuList is not None:
+        if tabuList.Update((node.id,colorToBeAssigned),int(violations[best])) and telemetry is not None:
+            telemetry.aspirationOverrides += 1
 
     return node.id,colorToBeAssigned
     
 #Return a the objective function value for a solution
 #If the solution break any constraint, it is penalized with 1.01 for each violated constraint
 def Evaluate(graph):
-    beta = 1 + int(0.1*math.sqrt(graph.GetDensity())) 
+    beta = 1 + int(0.1*graph.densityRoot) 
     #beta = int(1.25*math.sqrt(graph.length)) 
     return len(graph.colorsUsed) + beta*graph.violatedConstraints
 
 #Remove the color with the last color from the list and assign new colors for the 
 #nodes with missing color assignment
-def RemoveColor(graph):
+#The conflict structures are patched in place and only the nodes that had the removed color are recolored.
+#When a tabu list is given, it forgets the removed color and keeps the rest of its memory for the next search
+def RemoveColor(graph,tabuList = None):
 
     colorToBeRemoved = len(graph.colorsUsed)-1
+    removed = np.flatnonzero(graph.colors == colorToBeRemoved)
 
     #Remove the color from the domain
     graph.colorsUsed.remove(colorToBeRemoved)
-    #Remove the color from nodes,domains and adjacent color list
-    for i in range(0,graph.length):
-        if graph.nodes[i].color == colorToBeRemoved:
-            graph.nodes[i].color = -1
-        if colorToBeRemoved in graph.nodes[i].adjacentColors.keys():
-            graph.nodes[i].adjacentColors.pop(colorToBeRemoved,None)
-        graph.nodes[i].ColorsDomain = copy.deepcopy(graph.colorsUsed)
-        
+    graph.SetPalette(graph.colorsUsed)
+    #Conflicts between two nodes with the removed color disappear with it
+    graph.violatedConstraints -= int(graph.conflicts[removed,colorToBeRemoved].sum()) // 2
+    #Remove the color from nodes and adjacent color list
+    graph.conflicts[:,colorToBeRemoved] = 0
+    for i in removed.tolist():
+        graph.nodes[i].color = -1
+        graph.colors[i] = -1
+        graph.conflictingNodes.discard(i)
+    if tabuList is not None:
+        tabuList.RemoveColor(colorToBeRemoved)
     
-    #Assign new colors for the nodes without colors
-    nodes = GetUnassignedNodes(graph)
-    for i in range(0,len(nodes)):
-        nodeId,color = GetNextAssignment(nodes[i])
-        AssingColor(graph,nodeId,color,False)
+    #Assign new colors for the nodes that had the removed color
+    for i in removed.tolist():
+        nodeId,color = GetNextAssignment(graph.nodes[i],graph.paletteArray)
+        AssingColor(graph,nodeId,color)
 
     return graph
 
 #Assign a color to a node and update the graph constraint violations
-def AssingColor(graph,nodeId,color,removeFromDomain = True):   
+def AssingColor(graph,nodeId,color):   
     constraintsBeforeAssign = GetConstraintViolationsCount(graph.nodes[nodeId],graph.nodes[nodeId].color)
     
-    RemoveColorFromNeighbors(graph.nodes[nodeId],graph.nodes[nodeId].color)
+    RemoveColorFromNeighbors(graph,graph.nodes[nodeId],graph.nodes[nodeId].color)
     
     graph.nodes[nodeId].color = color
+    graph.colors[nodeId] = color
     graph.colorsUsed.add(color)
     
-    PropagateConstraint(graph.nodes[nodeId],color,removeFromDomain)
+    PropagateConstraint(graph,graph.nodes[nodeId],color)
     
     constraintsAfterAssign = GetConstraintViolationsCount(graph.nodes[nodeId],color)
+    if constraintsAfterAssign > 0:
+        graph.conflictingNodes.add(nodeId)
+    else:
+        graph.conflictingNodes.discard(nodeId)
     
     graph.violatedConstraints += (constraintsAfterAssign - constraintsBeforeAssign)
 
 
-def RemoveColorFromNeighbors(node,color):
-    for i in range(0,len(node.adjacentList)):
-        if(color in node.adjacentList[i].adjacentColors.keys()):
-            node.adjacentList[i].adjacentColors[color] -= 1
-            if node.adjacentList[i].adjacentColors[color] == 0:
-                node.adjacentList[i].adjacentColors.pop(color,None)
+#Neighbors with the same color that had this node as their only conflict stop conflicting
+def RemoveColorFromNeighbors(graph,node,color):
+    if color != -1:
+        graph.conflicts[node.adjacentIds,color] -= 1
+        sameColor = node.adjacentIds[graph.colors[node.adjacentIds] == color]
+        for adjacentId in sameColor[graph.conflicts[sameColor,color] == 0].tolist():
+            graph.conflictingNodes.discard(adjacentId)
 
 #Get the list of the nodes to be explored
 def GetExplorationList(graph):
@@ -419,43 +657,53 @@ def GetUnassignedNodes(graph):
                 nodes.append(graph.nodes[i])
     return nodes
 
-#Get an initial greedy solution
-#Try to assign the first color available for each node
-def GetInitialSolution(graph,colors): 
+#Get an initial solution with the chosen constructive heuristic
+#The greedy one tries to assign the first color available for each node, in index order
+def GetInitialSolution(graph,colors,constructor = Constructor.Greedy): 
     colorsUsed = set()
     nodes = GetUnassignedNodes(graph)
+    if constructor == Constructor.Greedy:
+        palette = np.array(sorted(colors),dtype=np.int64)
+        for i in range(0,len(nodes)):
+            color = GetNodeColor(nodes[i],palette)
+            graph.colors[nodes[i].id] = color
+            PropagateConstraint(graph,nodes[i],color)
+            colorsUsed.add(color)
+        return colorsUsed
+
+    if constructor == Constructor.DSatur:
+        coloring = Construction.getDSatur(graph.indptr,graph.indices)
+    else:
+        coloring = Construction.getRLF(graph.indptr,graph.indices)
     for i in range(0,len(nodes)):
-        color = GetNodeColor(nodes[i],colors)
-        PropagateConstraint(nodes[i],color)
+        color = int(coloring[nodes[i].id])
+        nodes[i].color = color
+        graph.colors[nodes[i].id] = color
+        PropagateConstraint(graph,nodes[i],color)
         colorsUsed.add(color)
 
     return colorsUsed
         
 
 #Get the first color available for each node
-def GetNodeColor (node,colors):
+def GetNodeColor (node,palette):
     if node.color != -1:
         return node.color
-    availableColors = colors - node.adjacentColors.keys()
-    node.color = min(availableColors)
+    node.color = int(palette[np.argmax(node.adjacentColors[palette] == 0)])
     return node.color
 
-#Assing a color for a node and remove the color from the other nodes domain
-def PropagateConstraint (node,color,removeFromDomain = True):
-    for i in range(0,len(node.adjacentList)):
-        if color in node.adjacentList[i].adjacentColors:
-            node.adjacentList[i].adjacentColors[color] += 1
-        else:
-            node.adjacentList[i].adjacentColors[color] = 1
-        if removeFromDomain:
-            if color in node.adjacentList[i].ColorsDomain:
-                node.adjacentList[i].ColorsDomain.remove(color)
+#Assing a color for a node and remove the color from the other nodes domain (their count for the color becomes positive)
+#Neighbors with the same color become conflicting
+def PropagateConstraint (graph,node,color):
+    graph.conflicts[node.adjacentIds,color] += 1
+    for adjacentId in node.adjacentIds[graph.colors[node.adjacentIds] == color].tolist():
+        graph.conflictingNodes.add(adjacentId)
 
 #Get the number of constraints violated by an assignment
 def GetConstraintViolationsCount(node,color):
-    if(color in node.adjacentColors.keys()):
-        return node.adjacentColors[color]
-    return 0
+    if(color == -1):
+        return 0
+    return int(node.adjacentColors[color])
 
 
 import sys
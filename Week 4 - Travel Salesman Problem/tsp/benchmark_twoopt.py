@@ -0,0 +1,54 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#Report the number of 2-opt moves evaluated per second (move generation and penalized evaluation) of TSP instances
+#Each instance starts from the initial solution (nodes visited in the input order), and the moves are evaluated from
+#evenly spaced base nodes against the swap nodes that follow them in the tour
+
+import io
+import os
+import time
+import contextlib
+from solver import BuildGraph,GetInitialSolution,GetTwoOptMove,EvaluateMovePenalized
+
+#Number of base nodes and of swap nodes evaluated for each one
+BASE_NODES = 50
+SWAP_NODES = 2000
+
+#Penalty weight of the moves
+ALPHA = 0.1
+
+#The sweep is repeated and the fastest one is reported
+REPEATS = 3
+
+def benchmark(file_location):
+    with open(file_location, 'r') as input_data_file:
+        input_data = input_data_file.read()
+    graph = BuildGraph(input_data)
+    with contextlib.redirect_stdout(io.StringIO()):
+        GetInitialSolution(graph)
+
+    bestRate = 0
+    for repeat in range(REPEATS):
+        evaluations = 0
+        candidates = 0
+        start = time.perf_counter()
+        for base in range(0,graph.length,max(1,graph.length//BASE_NODES)):
+            for offset in range(0,min(SWAP_NODES,graph.length-3)):
+                removedEdges,addedEdges = GetTwoOptMove(graph,graph.tourNodes[base],graph.tourNodes[(base+2+offset)%graph.length],ALPHA)
+                EvaluateMovePenalized(removedEdges,addedEdges,ALPHA)
+                evaluations += 1
+                if len(addedEdges) > 0:
+                    candidates += 1
+        end = time.perf_counter()
+        bestRate = max(bestRate,evaluations/(end-start))
+    return graph.length,evaluations,candidates,bestRate
+
+if __name__ == '__main__':
+    import sys
+    directory = './data'
+    names = sys.argv[1:] if len(sys.argv) > 1 else ['tsp_1000_1','tsp_33810_1','tsp_85900_1']
+    print("{:<16} {:>8} {:>12} {:>12} {:>16}".format("Instance","Nodes","Evaluations","Candidates","Evaluations/s"))
+    for name in names:
+        nodes,evaluations,candidates,rate = benchmark(os.path.join(directory,name))
+        print("{:<16} {:>8} {:>12} {:>12} {:>16.0f}".format(name,nodes,evaluations,candidates,rate))
@@ -28,8 +28,9 @@ from collections import deque
 #   This is necessary due the penalties that the Guided Local Search attributes to edges.
 #   Thus, edges (moves) that not improve the current solution are calculated (for evaluation), but discarted since no penalty will be attributed to them.
 #   Altough it can save memory, it might increase the computation time, since creating one edge is more expensive than only querying a value in a matrix
+#   The edge ID packs the node IDs into one integer (node1.id*nodeCount + node2.id), so the pools and adjacent lists are keyed by ints
 class Edge:
-    def __init__(self,p1,p2):
+    def __init__(self,p1,p2,nodeCount):
         self.length = -1 #  Distance between node 1 and node 2
         self.penalty = 0 #  Guided local search penalty
         
@@ -43,7 +44,7 @@ class Edge:
             self.node1 = p2 #   Node 1
             self.node2 = p1 #   node 2 
 
-        self.id = str(self.node1.id)+"-"+str(self.node2.id)
+        self.id = self.node1.id*nodeCount + self.node2.id
         self.util = -1 #    Guided Local Search utility function value
 
     #   Calculate the length in case it was not calculated before and store it in the local variable. Otherwise, just return the stored value
@@ -63,57 +64,11 @@ class Node:
         self.x = x #    Euclidean X coordinate
         self.y = y #    Euclidean Y coordinate
         self.id = id #  Node ID
-        self.adjacentList = {} #    Edges that are adjacent to this node - Store the edge because once it is calculated, we do not need to computate it again
         self.active = True #    Active flag for the Fast Local Search procedure
         self.tourPos = -1 # the position of the node in the Tour List
-    
-    #   Return the adjacent Nodes of a node
-    #   List[0] = Previous Node
-    #   List[1] = Next Node
-    def GetAdjacentNodes(self,tourSize):
-        adjacentNodes = [None,None]
-        aux = []
-        for key in self.adjacentList:
-            node = self.adjacentList[key].node1 if self.adjacentList[key].node1.id != self.id else self.adjacentList[key].node2
-            aux.append(node)
-
-        #   In case the node is at the ends of the Tour List, the calculation is reversed than when the node is not at the ends
-        if(self.tourPos == 0 or self.tourPos == tourSize-1):
-            if self.tourPos - aux[0].tourPos < self.tourPos - aux[1].tourPos:
-                adjacentNodes[0] = aux[0]
-                adjacentNodes[1] = aux[1]
-            else:
-                adjacentNodes[0] = aux[1]
-                adjacentNodes[1] = aux[0]
-        else:
-            if self.tourPos - aux[0].tourPos > self.tourPos - aux[1].tourPos:
-                adjacentNodes[0] = aux[0]
-                adjacentNodes[1] = aux[1]
-            else:
-                adjacentNodes[0] = aux[1]
-                adjacentNodes[1] = aux[0]
-
-        return adjacentNodes
-    
-    #   Get the Foward edge of the node
-    #   Eg. If the node is 2, and the edges are 1<->2<->3, return the 2<->3 edge 
-    def GetNextEdge(self,tourSize):
-
-        nexNode = self.GetAdjacentNodes(tourSize)[1]
-        for key in self.adjacentList:
-            if (self.adjacentList[key].node1.id == nexNode.id or self.adjacentList[key].node2.id == nexNode.id):
-                return self.adjacentList[key]
-        return None        
-
-    #   Get the previous edge of the node
-    #   Eg. If the node is 2, and the edges are 1<->2<->3, return the 1<->2 edge 
-    def GetPreviousEdge(self,tourSize):
-        prevNode = self.GetAdjacentNodes(tourSize)[0]
-        for key in self.adjacentList:
-            if (self.adjacentList[key].node1.id == prevNode.id or self.adjacentList[key].node2.id == prevNode.id):
-                return self.adjacentList[key]
-        return None
 
+#   The tour is kept as arrays: tourNodes is the visiting order and node.tourPos the position of each node in it,
+#   so the previous and next nodes of a node are read in O(1). The edges are only needed for their lengths and penalties
 class Graph:
     def __init__ (self):
         self.nodes = [] #   All nodes of the graph
@@ -132,8 +87,6 @@ class Graph:
     #   Adds and edge in the current tour
     def addEgdeinTour(self,edge): 
         self.tourEdges[edge.id] = edge
-        self.nodes[edge.node1.id].adjacentList[edge.id] = edge
-        self.nodes[edge.node2.id].adjacentList[edge.id] = edge
         self.tourLength = self.tourLength + edge.GetLength()
         self.addEgdeinPool(edge)
         
@@ -150,33 +103,48 @@ class Graph:
     def deleteEdgeinTour(self,edge):      
         distance = edge.GetLength()
         self.tourLength = self.tourLength - distance
-        id = edge.id
-        del edge.node1.adjacentList[id]
-        del edge.node2.adjacentList[id]  
-        del self.tourEdges[id]
+        del self.tourEdges[edge.id]
         gc.collect()
 
+    #   Get the ID of the edge between two nodes: node1.id*length + node2.id where node1.id<node2.id
+    def getEdgeId(self,nodeId1,nodeId2):
+        if (nodeId1 < nodeId2):
+            return nodeId1*self.length + nodeId2
+        return nodeId2*self.length + nodeId1
+
     #   Get and edge from the Edges' Pool, or return None if the edge is not found.
-    #   All edges Ids are in the for node1.id-node2.id where node1.id<node2.id
     #   Eg. If the query is by node1.id = 2, and node 2.id = 1, the Edge queried will be 1<->2
     def getEdgeFromPool(self,nodeId1,nodeId2):
-        if (nodeId1 < nodeId2):
-            key = str(nodeId1)+"-"+str(nodeId2)
-            if key in self.edgesPool:
-                return self.edgesPool[key]
-            else:
-                return None
-        else:
-            key = str(nodeId2)+"-"+str(nodeId1)
-            if key in self.edgesPool:
-                return self.edgesPool[key]
-            else:
-                return None
+        return self.edgesPool.get(self.getEdgeId(nodeId1,nodeId2))
+
+    #   Get the next node of a node in the tour
+    def GetNextNode(self,node):
+        return self.tourNodes[(node.tourPos+1)%self.length]
+
+    #   Get the previous node of a node in the tour
+    def GetPreviousNode(self,node):
+        return self.tourNodes[node.tourPos-1]
+
+    #   Return the adjacent Nodes of a node
+    #   List[0] = Previous Node
+    #   List[1] = Next Node
+    def GetAdjacentNodes(self,node):
+        return [self.GetPreviousNode(node),self.GetNextNode(node)]
+
+    #   Get the Foward edge of the node
+    #   Eg. If the node is 2, and the edges are 1<->2<->3, return the 2<->3 edge 
+    def GetNextEdge(self,node):
+        return self.tourEdges.get(self.getEdgeId(node.id,self.GetNextNode(node).id))
+
+    #   Get the previous edge of the node
+    #   Eg. If the node is 2, and the edges are 1<->2<->3, return the 1<->2 edge 
+    def GetPreviousEdge(self,node):
+        return self.tourEdges.get(self.getEdgeId(node.id,self.GetPreviousNode(node).id))
 
     #   Swap 2 nodes in the tour.
     #   Used by the Swap Heuristic Function
     def SwapNodesInTour(self,node1,node2):
-        a, b = self.tourNodes.index(node1), self.tourNodes.index(node2)
+        a, b = node1.tourPos, node2.tourPos
         self.tourNodes[b].tourPos, self.tourNodes[a].tourPos = self.tourNodes[a].tourPos, self.tourNodes[b].tourPos
         self.tourNodes[b], self.tourNodes[a] = self.tourNodes[a], self.tourNodes[b]
 
@@ -228,7 +196,7 @@ class Graph:
     #   The final step is attribute the right position for each node in the list
 
     def SwapEdgesInTour(self,node1,node2):    
-        swapNextPos = node2.GetAdjacentNodes(len(self.tourNodes))[1]
+        swapNextPos = self.GetNextNode(node2)
         newRoute = []
 
         i = (swapNextPos.tourPos)%self.length
@@ -300,18 +268,8 @@ def solve_it(input_data):
     # Modify this code to run your optimization algorithm
     start = time.time()
     print("Start DateTime: {}".format(datetime.datetime.now()))
-    graph = Graph()
     # parse the input
-    lines = input_data.split('\n')
-
-    nodeCount = int(lines[0])
-
-    for i in range(1, nodeCount+1):
-        line = lines[i]
-        parts = line.split()
-
-        #Build the graph (Without the edges)
-        graph.addNode(Node(i-1,float(parts[0]),float(parts[1])))
+    graph = BuildGraph(input_data)
 
     #Get The params for the problem instance
     if(graph.length < 200): 
@@ -344,6 +302,19 @@ def solve_it(input_data):
 #       Utility Methods        #
 ################################
 
+#   Read the instance and build the graph (without the edges)
+def BuildGraph(input_data):
+    graph = Graph()
+    lines = input_data.split('\n')
+
+    nodeCount = int(lines[0])
+
+    for i in range(1, nodeCount+1):
+        line = lines[i]
+        parts = line.split()
+        graph.addNode(Node(i-1,float(parts[0]),float(parts[1])))
+    return graph
+
 # Return the time from hour, second and secods to seconds
 def getTimeInSeconds(hours,minutes,seconds):
     return (((hours*3600)+(minutes*60)+seconds))
@@ -476,11 +447,11 @@ def GetInitialSolution(graph):
     print("=========================================================")
     print("Instance: {} - Initial Solution Start".format(graph.length))
     for index in range(0, graph.length-1):
-        edge = Edge(graph.nodes[index],graph.nodes[index+1]) 
+        edge = Edge(graph.nodes[index],graph.nodes[index+1],graph.length) 
         graph.addEgdeinTour(edge)
         graph.addNodeinTour(graph.nodes[index])
 
-    edge = Edge(graph.nodes[0],graph.nodes[-1])
+    edge = Edge(graph.nodes[0],graph.nodes[-1],graph.length)
     graph.addEgdeinTour(edge)
     graph.addNodeinTour(graph.nodes[-1])
 
@@ -532,7 +503,7 @@ def GetNearestNeighbourSolution(graph):
             bestNode = graph.tourNodes[0]
             bestManhatanEdgeDistance = math.fabs(currentNode.x-graph.nodes[0].x) + math.fabs(currentNode.y-graph.nodes[0].y)
   
-        bestEdge = Edge(currentNode,bestNode)
+        bestEdge = Edge(currentNode,bestNode,graph.length)
         graph.addEgdeinTour(bestEdge)
         graph.addNodeinTour(currentNode)
         graph.addEgdeinPool(bestEdge)       
@@ -730,7 +701,7 @@ def RandomSwaps(graph,swapsLimit):
 
 def TwoOpt(graph,node,alpha=1,improvementType = ImprovementType.First):
     global clock
-    currentNode = graph.tourNodes.index(node)
+    currentNode = node.tourPos
     swapNodes = []
     currentRemovedEdges = [] 
     currentAddedEdges = []
@@ -769,10 +740,10 @@ def TwoOpt(graph,node,alpha=1,improvementType = ImprovementType.First):
 def GetTwoOptMove(graph,currentNode,swapNode,alpha):
     removedEdges = []
     addedEdges = []
-    currentNodeAdjacency = currentNode.GetAdjacentNodes(len(graph.tourNodes))
-    swapNodeAdjacency = swapNode.GetAdjacentNodes(len(graph.tourNodes))
-    currentNodeEdge = currentNode.GetNextEdge(graph.length)
-    swapNodeEdge = swapNode.GetNextEdge(graph.length)
+    currentNodeAdjacency = graph.GetAdjacentNodes(currentNode)
+    swapNodeAdjacency = graph.GetAdjacentNodes(swapNode)
+    currentNodeEdge = graph.GetNextEdge(currentNode)
+    swapNodeEdge = graph.GetNextEdge(swapNode)
     #Manhatan Distance Checking
     #For better performance (both time and memory), the manhatam distance heuristic is used
     currentManhatamAddedDistance = math.fabs(currentNode.x-swapNode.x) + math.fabs(currentNode.y-swapNode.y)
@@ -793,13 +764,13 @@ def GetTwoOptMove(graph,currentNode,swapNode,alpha):
     #Edge linking the current Node to the swap node
     newCurrentEdge = graph.getEdgeFromPool(currentNode.id,swapNode.id)
     if(newCurrentEdge is None):
-        newCurrentEdge = Edge(currentNode,swapNode)
+        newCurrentEdge = Edge(currentNode,swapNode,graph.length)
         graph.addEgdeinPool(newCurrentEdge)
 
     #Edge linking the Foward Adjacent Node from Current node and the Foward Adjacent Node from swap node
     newSwapEdge = graph.getEdgeFromPool(currentNodeAdjacency[1].id,swapNodeAdjacency[1].id)
     if(newSwapEdge is None):
-        newSwapEdge = Edge(currentNodeAdjacency[1],swapNodeAdjacency[1])
+        newSwapEdge = Edge(currentNodeAdjacency[1],swapNodeAdjacency[1],graph.length)
         graph.addEgdeinPool(newSwapEdge)
 
     addedEdges.append(newCurrentEdge)
@@ -811,7 +782,7 @@ def GetTwoOptMove(graph,currentNode,swapNode,alpha):
 #   The method returns what edges must be added/removed and which nodes must be place in the active list in the Fast Local Search Procedure.
 def Swap(graph,node,alpha=1,improvementType = ImprovementType.First):
     global clock
-    currentNode = graph.tourNodes.index(node)
+    currentNode = node.tourPos
     swapNodes = []
     currentRemovedEdges = [] 
     currentAddedEdges = []
@@ -853,19 +824,19 @@ def GetSwapMove(graph,currentNode,swapNode):
     removedEdges = []
     addedEdges = []
     #Get Adjacent nodes in order to create the new edges
-    currentNodeAdjacency = currentNode.GetAdjacentNodes(len(graph.tourNodes))
-    swapNodeAdjacency = swapNode.GetAdjacentNodes(len(graph.tourNodes))
+    currentNodeAdjacency = graph.GetAdjacentNodes(currentNode)
+    swapNodeAdjacency = graph.GetAdjacentNodes(swapNode)
     
     #Include the current adjacent edges in the edges to be removed
-    for key in currentNode.adjacentList:
+    for edge in (graph.GetPreviousEdge(currentNode),graph.GetNextEdge(currentNode)):
         #Only Removes the edge if current node and swap node are not adjcent
-        if(currentNode.adjacentList[key].node1.id != swapNode.id and currentNode.adjacentList[key].node2.id != swapNode.id):
-            removedEdges.append(currentNode.adjacentList[key])
+        if(edge.node1.id != swapNode.id and edge.node2.id != swapNode.id):
+            removedEdges.append(edge)
 
-    for key in swapNode.adjacentList:
+    for edge in (graph.GetPreviousEdge(swapNode),graph.GetNextEdge(swapNode)):
         #Only Removes the edge if current node and swap node are not adjcent
-        if(swapNode.adjacentList[key].node1.id != currentNode.id and swapNode.adjacentList[key].node2.id != currentNode.id):
-            removedEdges.append(swapNode.adjacentList[key])
+        if(edge.node1.id != currentNode.id and edge.node2.id != currentNode.id):
+            removedEdges.append(edge)
 
     #Edges to Add
     #Swap positions
@@ -874,7 +845,7 @@ def GetSwapMove(graph,currentNode,swapNode):
         if(node.id != swapNode.id):
             newEdge = graph.getEdgeFromPool(swapNode.id,node.id)
             if(newEdge is None):
-                newEdge = Edge(swapNode,node)
+                newEdge = Edge(swapNode,node,graph.length)
                 graph.addEgdeinPool(newEdge)
             addedEdges.append(newEdge)
             # print("Edge to be Added: {} ".format(newEdge.id))
@@ -884,7 +855,7 @@ def GetSwapMove(graph,currentNode,swapNode):
         if(node.id != currentNode.id):
             newEdge = graph.getEdgeFromPool(currentNode.id,node.id)
             if(newEdge is None):
-                newEdge = Edge(currentNode,node)
+                newEdge = Edge(currentNode,node,graph.length)
                 graph.addEgdeinPool(newEdge)
             addedEdges.append(newEdge)
 